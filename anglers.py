@@ -0,0 +1,117 @@
+import json
+from collections.abc import Iterable
+from sqlite3 import Connection
+
+from names import normalize_name
+
+ANGLER_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS anglers (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+        norm TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS result_anglers (
+        angler_id INTEGER NOT NULL REFERENCES anglers (id),
+        result_id INTEGER NOT NULL,  -- results.rowid
+        PRIMARY KEY (angler_id, result_id)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def create_anglers(conn: Connection) -> None:
+    for ddl in ANGLER_DDL:
+        conn.execute(ddl)
+    conn.create_function("normalize_name", 1, normalize_name, deterministic=True)
+
+
+def _link(conn: Connection, ids: str, params: tuple) -> None:
+    where = f"r.tournament_id IN ({ids})"
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO anglers (name, norm)
+        SELECT name, normalize_name(name) FROM (
+            SELECT r.angler1 AS name FROM results r WHERE {where}
+            UNION
+            SELECT r.angler2 FROM results r WHERE {where}
+        )
+        WHERE name IS NOT NULL AND name != ''
+        """,
+        params * 2,
+    )
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO result_anglers (angler_id, result_id)
+        SELECT a.id, r.rowid FROM results r JOIN anglers a ON a.name = r.angler1
+        WHERE {where}
+        UNION ALL
+        SELECT a.id, r.rowid FROM results r JOIN anglers a ON a.name = r.angler2
+        WHERE {where}
+        """,
+        params * 2,
+    )
+
+
+def link_anglers(conn: Connection, tournament_ids: Iterable[int]) -> None:
+    ids = json.dumps(list(tournament_ids))
+    if ids == "[]":
+        return
+    create_anglers(conn)
+    _link(conn, "SELECT value FROM json_each(?)", (ids,))
+
+
+def unlink_anglers(conn: Connection, tournament_ids: Iterable[int]) -> list[int]:
+    # Drop the links for results that are about to be deleted and reloaded,
+    # and return the anglers unlinked. Finds them through the names like
+    # _link() does, so each delete is a primary key lookup rather than a
+    # search for result_id.
+    ids = json.dumps(list(tournament_ids))
+    if ids == "[]":
+        return []
+    create_anglers(conn)
+    where = "r.tournament_id IN (SELECT value FROM json_each(?))"
+    links = conn.execute(
+        f"""
+        SELECT a.id, r.rowid FROM results r JOIN anglers a ON a.name = r.angler1
+        WHERE {where}
+        UNION ALL
+        SELECT a.id, r.rowid FROM results r JOIN anglers a ON a.name = r.angler2
+        WHERE {where}
+        """,
+        (ids, ids),
+    ).fetchall()
+    conn.executemany(
+        "DELETE FROM result_anglers WHERE angler_id = ? AND result_id = ?", links
+    )
+    return sorted({a_id for a_id, _ in links})
+
+
+def orphaned_anglers(conn: Connection, angler_ids: Iterable[int]) -> list[int]:
+    # Those of the anglers left without a result, e.g. after a reload
+    # changed the spelling of their name.
+    return [
+        a_id
+        for (a_id,) in conn.execute(
+            "SELECT value FROM json_each(?) WHERE NOT EXISTS"
+            " (SELECT 1 FROM result_anglers WHERE angler_id = value)",
+            (json.dumps(list(angler_ids)),),
+        )
+    ]
+
+
+def delete_anglers(conn: Connection, angler_ids: Iterable[int]) -> None:
+    # The anglers' rows in the search and rating tables go first.
+    conn.execute(
+        "DELETE FROM anglers WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(angler_ids)),),
+    )
+
+
+def rebuild_anglers(conn: Connection) -> None:
+    create_anglers(conn)
+    conn.execute("DELETE FROM result_anglers")
+    conn.execute("DELETE FROM anglers")
+    _link(conn, "SELECT id FROM tournaments", ())
@@ -1,26 +1,94 @@
+import threading
+from importlib import import_module
+from sqlite3 import Connection
+
 import streamlit as st
 
-from ui import (
-    angler_perf,
-    avg_winning_wt,
-    avg_winning_wt_lake,
-    top_twenty,
-    winning_wt_lake,
-)
+import perf
+import warmup
+from db import db_conn, get_pool
+from registry import validate
+from schema import SchemaError, check_schema
+
+
+@st.cache_resource
+@db_conn
+def check_queries(c: Connection) -> None:
+    check_schema(c)
+    validate(c)
+
+
+@st.cache_resource
+def start_warm_up() -> threading.Thread:
+    # Once per server process, in the background, so the first visitor isn't
+    # kept waiting for it.
+    thread = threading.Thread(target=warmup.warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def lazy_page(module: str):
+    # A page's module (and altair with it) is only imported once the page is
+    # first shown.
+    def page():
+        import_module(f"ui.{module}").show()
+
+    page.__name__ = module
+    return page
 
 
 def main():
     st.set_page_config(layout="wide")
     st.title("BASS CHAMPS Tournament Data")
+    if not get_pool().health_check():
+        st.error("Tournament database is unavailable.")
+        st.stop()
+    try:
+        check_queries()
+    except SchemaError as e:
+        st.error(str(e))
+        st.stop()
+    if warmup.ENABLED:
+        start_warm_up()
 
-    for section in [
-        avg_winning_wt.show,
-        avg_winning_wt_lake.show,
-        winning_wt_lake.show,
-        top_twenty.show,
-        angler_perf.show,
-    ]:
-        section()
+    page = st.navigation(
+        [
+            st.Page(
+                lazy_page("avg_winning_wt"),
+                title="Avg Winning Weight",
+                url_path="avg-winning-weight",
+                default=True,
+            ),
+            st.Page(
+                lazy_page("avg_winning_wt_lake"),
+                title="Avg Winning Weight by Lake",
+                url_path="avg-winning-weight-lake",
+            ),
+            st.Page(
+                lazy_page("winning_wt_lake"),
+                title="Winning Weights by Lake",
+                url_path="winning-weight-lake",
+            ),
+            st.Page(lazy_page("top_twenty"), title="Top 20", url_path="top-twenty"),
+            st.Page(
+                lazy_page("angler_perf"), title="Angler Performance", url_path="anglers"
+            ),
+            st.Page(
+                lazy_page("leaderboard"), title="Power Ratings", url_path="ratings"
+            ),
+        ]
+    )
+    # The search box is on every page; while it holds text its hits replace
+    # the page.
+    text = st.sidebar.text_input(
+        "Search", placeholder="Tournament, lake, angler, hometown ...", key="search"
+    )
+    if text.strip():
+        import_module("ui.search").show(text)
+    else:
+        page.run()
+    if perf.ENABLED:
+        import_module("ui.perf_panel").show()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CHART_QUERIES = ["avg_wt_yr", "avg_win_wt_lake", "wt_lake_year", "tournaments"]
+
+# Runs in a fresh interpreter per sample so imports, connection/mmap setup and
+# the first query of each chart are all cold (apart from the OS page cache).
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import db, registry
+imported = time.perf_counter()
+with db.get_pool().connection() as c:
+    for name in {queries!r}:
+        registry.get_query(name)(c)
+done = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "query_s": done - imported,
+    "total_s": done - start,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def sample(backend: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=str(ROOT), queries=CHART_QUERIES)],
+        env={**env, "TD_BACKEND": backend},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=str(ROOT / "tournaments.db"))
+    parser.add_argument("--snapshot", help="defaults to the db's path with .arrow")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Where the load scripts export it (snapshot.snapshot_path).
+    snapshot = args.snapshot or str(Path(args.db).with_suffix(".arrow"))
+    env = {**os.environ, "TD_DB": args.db, "TD_SNAPSHOT": snapshot}
+    print(f"{'backend':>8} {'import':>9} {'queries':>9} {'total':>9} {'rss':>9}")
+    for backend in ["sqlite", "arrow"]:
+        runs = [sample(backend, env) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        print(
+            f"{backend:>8} {med['import_s']:>8.3f}s {med['query_s']:>8.3f}s "
+            f"{med['total_s']:>8.3f}s {med['maxrss_mb']:>6.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
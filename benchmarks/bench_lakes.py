@@ -0,0 +1,84 @@
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_FILE  # noqa: E402
+from lakes import LAKES, resolve_lake  # noqa: E402
+
+WORDS = ["Team", "Classic", "Open", "Championship", "Central", "North", "Fall"]
+
+
+def legacy_lake(tournament: str | None) -> str | None:
+    # The loader's old resolution: first alias in dict order found anywhere.
+    name = (tournament or "").lower()
+    for ident, lake in LAKES.items():
+        if ident in name:
+            return lake
+    return None
+
+
+def corpus(db_file: Path, synthetic: int) -> list[str]:
+    # Every tournament name in the database plus synthetic names mixing
+    # aliases (in any case, sometimes two of them) with filler words.
+    names = []
+    if db_file.exists():
+        conn = sqlite3.connect(f"{db_file.as_uri()}?mode=ro", uri=True)
+        names = [n for (n,) in conn.execute("SELECT tournament FROM tournaments")]
+        conn.close()
+    rng = random.Random(0)
+    aliases = list(LAKES)
+    for _ in range(synthetic):
+        words = rng.sample(WORDS, 3)
+        for alias in rng.sample(aliases, rng.choice([0, 1, 1, 1, 2])):
+            words.insert(rng.randrange(len(words) + 1), alias.title())
+        names.append(" ".join(words))
+    return names
+
+
+def expected(name: str) -> str | None:
+    # The alias that starts first, the longest of those starting there.
+    lower = name.lower()
+    hits = [(lower.find(a), -len(a), a) for a in LAKES if a in lower]
+    return LAKES[min(hits)[2]] if hits else None
+
+
+def timed(func, names) -> float:
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    parser.add_argument("--synthetic", type=int, default=200_000)
+    args = parser.parse_args()
+
+    names = corpus(args.db, args.synthetic)
+    wrong = [n for n in names if resolve_lake(n) != expected(n)]
+    assert not wrong, f"{len(wrong)} names resolved wrongly, e.g. {wrong[:5]}"
+    # Only names with more than one alias may differ from the old loop.
+    changed = [n for n in names if resolve_lake(n) != legacy_lake(n)]
+    assert all(sum(a in n.lower() for a in LAKES) > 1 for n in changed), (
+        "a single-alias name changed lake"
+    )
+
+    legacy_s = timed(legacy_lake, names)
+    compiled_s = timed(resolve_lake, names)
+    print(
+        f"{len(names)} names, {len(changed)} with several aliases resolve differently"
+    )
+    print(f"{'resolver':>10} {'seconds':>8} {'names/s':>10}")
+    for label, seconds in [("legacy", legacy_s), ("compiled", compiled_s)]:
+        print(f"{label:>10} {seconds:>8.2f} {len(names) / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from anglers import link_anglers  # noqa: E402
+from lakes import apply_overrides  # noqa: E402
+from loader import LOAD_PRAGMAS, load_files, read_tournament  # noqa: E402
+from ratings import update_ratings  # noqa: E402
+from schema import analyze, migrate  # noqa: E402
+from search import add_results  # noqa: E402
+from summary import refresh_summaries  # noqa: E402
+from synthetic import anglers_for, write_json  # noqa: E402
+
+
+def load_row_by_row(conn: sqlite3.Connection, paths) -> list[int]:
+    # The loader as it was: an existence query per file, an execute per row
+    # and one transaction. The schema, pragmas and the upkeep of the derived
+    # tables are load_files()'s, so only the insert path differs.
+    for pragma, value in LOAD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    migrate(conn)
+    cursor = conn.cursor()
+    inserted = []
+    conn.execute("BEGIN IMMEDIATE")
+    for path in paths:
+        (date, lake, region, name, trail), results = read_tournament(path)
+        cursor.execute(
+            "SELECT id FROM tournaments WHERE date = ? AND tournament = ?",
+            (date, name),
+        )
+        if cursor.fetchone():
+            continue
+        cursor.execute(
+            "INSERT INTO tournaments (date, lake, region, tournament, tournament_trail)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (date, lake, region, name, trail),
+        )
+        t_id = cursor.lastrowid
+        inserted.append(t_id)
+        for r in results:
+            cursor.execute(
+                "INSERT INTO results (tournament_id, place, skeeter_boat, angler1,"
+                " angler1_hometown, angler2, angler2_hometown, fish, big_bass,"
+                " weight, prize) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (t_id, *r),
+            )
+    apply_overrides(conn, inserted)
+    link_anglers(conn, inserted)
+    add_results(conn, inserted)
+    refresh_summaries(conn, inserted)
+    update_ratings(conn, inserted)
+    conn.execute("COMMIT")
+    analyze(conn)
+    return inserted
+
+
+def write_bundles(bundle_dir: Path, paths) -> list[Path]:
+    # The same tournaments as NDJSON, one bundle per season.
+    bundle_dir.mkdir()
+    seasons = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        season = data["metadata"]["Date"][-4:]
+        seasons.setdefault(season, []).append(json.dumps(data))
+    bundles = []
+    for season, lines in sorted(seasons.items()):
+        bundle = bundle_dir / f"{season}.ndjson"
+        bundle.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        bundles.append(bundle)
+    return bundles
+
+
+def timed(func, *args, **kwargs) -> tuple[float, int]:
+    start = time.perf_counter()
+    n = len(func(*args, **kwargs))
+    return time.perf_counter() - start, n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, max(2, os.cpu_count() or 1)}),
+        help="decode processes to compare; an automatic pick is always added",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = write_json(tmp / "data", args.files, anglers=anglers_for(args.files))
+        bundles = write_bundles(tmp / "bundles", paths)
+
+        legacy = sqlite3.connect(tmp / "legacy.db", isolation_level=None)
+        legacy_s, _ = timed(load_row_by_row, legacy, paths)
+        legacy.close()
+
+        rows = [("row by row", legacy_s)]
+        for workers in [*args.workers, None]:
+            load = partial(load_files, batch_size=args.batch_size, workers=workers)
+            for label, source in [("files", paths), ("bundles", bundles)]:
+                conn = sqlite3.connect(
+                    tmp / f"{label}{workers}.db", isolation_level=None
+                )
+                procs = f"{workers} proc" if workers else "auto"
+                seconds, n = timed(load, conn, source)
+                assert n == args.files, f"loaded {n} of {args.files}"
+                rows.append((f"{label}, {procs}", seconds))
+                if label == "files" and workers == args.workers[-1]:
+                    again_s, again = timed(load, conn, source)
+                    assert again == 0
+                    rows.append(("reload", again_s))
+                    rows.append(("replace", timed(load, conn, source, replace=True)[0]))
+                conn.close()
+
+    n = args.files
+    print(f"{'load':>16} {'tournaments':>11} {'seconds':>8} {'per s':>8}")
+    for label, seconds in rows:
+        print(f"{label:>16} {n:>11} {seconds:>8.2f} {n / seconds:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import scrape_basschamps as scraper  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_corpus() -> list[tuple[str, bytes, str]]:
+    # Each tournament_*.html has the JSON the scraper wrote for it next to it.
+    return [
+        (
+            page.stem,
+            page.read_bytes(),
+            page.with_suffix(".json").read_text(encoding="utf-8"),
+        )
+        for page in sorted(FIXTURES.glob("tournament_*.html"))
+    ]
+
+
+def parsers() -> list[str]:
+    return ["html.parser"] + (["lxml"] if scraper.PARSER == "lxml" else [])
+
+
+def check(corpus, parser: str) -> None:
+    for name, page, expected in corpus:
+        got = json.dumps(scraper.parse_tournament_results(page, parser), indent=4)
+        assert got == expected, f"{parser}: {name} differs from its saved JSON"
+
+
+def bench(corpus, parser: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, page, _ in corpus:
+            scraper.parse_tournament_results(page, parser)
+    return len(corpus) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"{'parser':>12} {'pages':>6} {'pages/s':>8}")
+    for name in parsers():
+        check(corpus, name)
+        rate = bench(corpus, name, args.repeat)
+        print(f"{name:>12} {len(corpus) * args.repeat:>6} {rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import scrape_basschamps as scraper  # noqa: E402
+from fixtures import FixtureServer, build_site  # noqa: E402
+from link_registry import LinkRegistry  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def fetch_only(urls: list[str], workers: int) -> float:
+    start = time.perf_counter()
+    with scraper.Fetcher(max_workers=workers, rate=1000) as fetcher:
+        assert all(fetcher.map(fetcher.get, urls))
+    return time.perf_counter() - start
+
+
+def crawl(base_url: str, workers: int, years: int, links_file: Path) -> list[str]:
+    links_file.unlink(missing_ok=True)
+    links = LinkRegistry(links_file)
+    start = time.perf_counter()
+    with scraper.Fetcher(max_workers=workers, rate=1000) as fetcher:
+        scraper.get_tournament_links(
+            fetcher,
+            urls=scraper.generate_annual_links(2006, 2006 + years, base_url=base_url),
+            links=links,
+            base_url=base_url,
+        )
+        results = list(
+            fetcher.map(lambda url: scraper.get_tournament_results(fetcher, url), links)
+        )
+    elapsed = time.perf_counter() - start
+    links.compact()
+    assert all(r and r["results"] for r in results), "failed to scrape a fixture page"
+    return elapsed, list(links)
+
+
+def crawl_pipeline(base_url: str, workers: int, years: int, links_file: Path) -> float:
+    # Same crawl, but tournament pages go through the parser process pool.
+    links_file.unlink(missing_ok=True)
+    links = LinkRegistry(links_file)
+    results = []
+    start = time.perf_counter()
+    with scraper.Fetcher(max_workers=workers, rate=1000) as fetcher:
+        scraper.get_tournament_links(
+            fetcher,
+            urls=scraper.generate_annual_links(2006, 2006 + years, base_url=base_url),
+            links=links,
+            base_url=base_url,
+        )
+        scraper.run_pipeline(
+            scraper.fetch_stage(fetcher, list(links)),
+            lambda url, result: results.append(result),
+        )
+    elapsed = time.perf_counter() - start
+    links.compact()
+    assert len(results) == len(links), "failed to scrape a fixture page"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-year", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    site = build_site(2006, 2006 + args.years, args.per_year)
+    with tempfile.TemporaryDirectory() as tmp, FixtureServer(site, args.latency) as srv:
+        links_file = Path(tmp) / "links.json"
+        # Parsing is CPU-bound and holds the GIL, so report raw fetch
+        # throughput separately from the full links + results crawl.
+        _, links = crawl(srv.url, 8, args.years, links_file)
+        urls = (
+            scraper.generate_annual_links(2006, 2006 + args.years, base_url=srv.url)
+            + links
+        )
+        print(f"parse processes: {scraper.PARSE_WORKERS}")
+        print(
+            f"{'workers':>8} {'pages':>6} {'fetch/s':>8} {'crawl/s':>8} {'pipe/s':>8}"
+        )
+        for workers in args.workers:
+            fetch_s = fetch_only(urls, workers)
+            crawl_s, _ = crawl(srv.url, workers, args.years, links_file)
+            pipe_s = crawl_pipeline(srv.url, workers, args.years, links_file)
+            n = len(urls)
+            print(
+                f"{workers:>8} {n:>6} {n / fetch_s:>8.1f} {n / crawl_s:>8.1f}"
+                f" {n / pipe_s:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from constants import PLACES  # noqa: E402
+from ui.charts import stacked_labels  # noqa: E402
+
+
+def iterrows_labels(df: pd.DataFrame) -> pd.DataFrame:
+    # The row-by-row construction stacked_labels replaced, kept as a baseline.
+    rows = []
+    for _, r in df.iterrows():
+        y, lake = r["year"], r["lake"]
+        p = {1: r.get(1, 0), 2: r.get(2, 0), 3: r.get(3, 0)}
+        base = 0
+        for place, emoji in zip([3, 2, 1], PLACES[::-1]):
+            height = p[place]
+            rows.append(
+                {
+                    "year": y,
+                    "lake": lake,
+                    "place": emoji,
+                    "weight": height,
+                    "label_y": base + height / 2,
+                    "label": f"{height:.2f}",
+                    "weight_lbs": f"{height:.2f} lbs",
+                }
+            )
+            base += height
+    return pd.DataFrame(rows)
+
+
+def synthetic_pivot(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "year": (2006 + np.arange(n_rows) % 50).astype(str),
+            "lake": [f"Lake {i}" for i in range(n_rows)],
+            1: rng.uniform(10, 40, n_rows).round(2),
+            2: rng.uniform(10, 35, n_rows).round(2),
+            3: rng.uniform(10, 30, n_rows).round(2),
+        }
+    )
+    df.loc[rng.random(n_rows) < 0.05, 3] = 0  # fillna(0) gaps in the pivot
+    return df
+
+
+def timed(func, *args) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    out = func(*args)
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 300_000]
+    )
+    parser.add_argument("--baseline-max", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'vectorized':>12} {'iterrows':>12} {'speedup':>9}")
+    for n in args.sizes:
+        df = synthetic_pivot(n)
+        fast_s, fast = timed(stacked_labels, df, ["year", "lake"], "weight")
+        if n > args.baseline_max:
+            print(f"{n:>9} {fast_s:>11.3f}s {'-':>12} {'-':>9}")
+            continue
+        slow_s, slow = timed(iterrows_labels, df)
+        pd.testing.assert_frame_equal(fast, slow, check_dtype=False)
+        print(f"{n:>9} {fast_s:>11.3f}s {slow_s:>11.3f}s {slow_s / fast_s:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
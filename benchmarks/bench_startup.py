@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# One server start per sample, in a fresh interpreter. "cold" is the first
+# visitor right after a start; "warm" is the first visitor once the boot
+# warm-up has finished. AppTest runs the whole script in process, like a
+# session on the server, so a render includes the page's lazy imports.
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import app
+imported = time.perf_counter()
+warmed = imported
+if {warm!r}:
+    import warmup
+    warmup.warm_up()
+    warmed = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+before = time.perf_counter()
+at.run()
+first = time.perf_counter()
+assert not at.exception, [e.message for e in at.exception]
+AppTest.from_file({app!r}, default_timeout=120).run()
+second = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "warm_up_s": warmed - imported,
+    "first_render_s": first - before,
+    "second_render_s": second - first,
+}}))
+"""
+
+
+def sample(warm: bool, env: dict) -> dict:
+    code = CHILD.format(root=str(ROOT), app=str(ROOT / "app.py"), warm=warm)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=str(ROOT / "tournaments.db"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # The app's own background warm-up stays off, so "cold" really is.
+    env = {**os.environ, "TD_DB": args.db, "TD_WARMUP": "0"}
+    columns = ["import_s", "warm_up_s", "first_render_s", "second_render_s"]
+    print(f"{'start':>6} {'import':>9} {'warm-up':>9} {'1st view':>9} {'2nd view':>9}")
+    for label, warm in [("cold", False), ("warm", True)]:
+        runs = [sample(warm, env) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in columns}
+        print(f"{label:>6} " + " ".join(f"{med[k]:>8.3f}s" for k in columns))
+    print("time to first render = import + 1st view (the warm-up runs before it)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_parser import load_corpus, parsers, scraper  # noqa: E402
+from synthetic import anglers_for, write_json  # noqa: E402
+
+from db import QUERY_CACHE, ConnectionPool  # noqa: E402
+from loader import load_files, tournament_files  # noqa: E402
+from name_index import NameIndex  # noqa: E402
+from registry import queries  # noqa: E402
+from search import match_query  # noqa: E402
+from ui import (  # noqa: E402
+    angler_perf,
+    avg_winning_wt,
+    avg_winning_wt_lake,
+    leaderboard,
+    search,
+    top_twenty,
+    winning_wt_lake,
+)
+
+# 250 tournaments is about the size of the real database.
+SIZES = [250, 2500, 25000]
+
+
+def measure(func, runs: int, setup=None) -> list[float]:
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def result(group: str, name: str, times: list[float], **extra) -> dict:
+    return {
+        "group": group,
+        "name": name,
+        "runs": len(times),
+        "min_s": min(times),
+        "p50_s": statistics.median(times),
+        "max_s": max(times),
+        **extra,
+    }
+
+
+def cold() -> None:
+    # Every run pays for the query, as on the first render after a load.
+    QUERY_CACHE.clear()
+    top_twenty._results_cache.clear()
+
+
+def query_params(c: sqlite3.Connection) -> dict[str, tuple]:
+    # What the pages pass: the newest tournament of every year, and the angler
+    # with the most results.
+    (ids,) = c.execute(
+        "SELECT json_group_array(id) FROM (SELECT MAX(id) AS id FROM tournaments"
+        " GROUP BY strftime('%Y', date))"
+    ).fetchone()
+    (angler,) = c.execute(
+        "SELECT a.name FROM anglers a JOIN result_anglers ra ON ra.angler_id = a.id"
+        " GROUP BY a.id ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+    # The search box gets a lake and a surname; the leaderboards their
+    # defaults.
+    return {
+        "top_twenty": (ids,),
+        "angler_performance": (angler,),
+        "angler_ratings": (leaderboard.MIN_EVENTS, leaderboard.LIMIT),
+        "team_ratings": (leaderboard.MIN_EVENTS, leaderboard.LIMIT),
+        "search_tournaments": (match_query("lake"), search.LIMIT),
+        "search_anglers": (match_query(angler.split()[-1]), search.LIMIT),
+    }
+
+
+def search_terms(names: list[str], count: int) -> list[str]:
+    # Exact names, lowercase prefixes and misspellings, spread over the index.
+    terms = []
+    for n, name in enumerate(names[:: max(1, len(names) // count)][:count]):
+        if n % 3 == 0:
+            terms.append(name)
+        elif n % 3 == 1:
+            terms.append(name.lower()[: max(3, len(name) // 2)])
+        else:
+            terms.append(name[:2] + name[3:])  # a dropped letter
+    return terms
+
+
+def bench_size(db_file: Path, data_dir: Path, tournaments: int, runs: int) -> list:
+    out = []
+    size = {"tournaments": tournaments}
+
+    paths = tournament_files(data_dir)
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    start = time.perf_counter()
+    load_files(conn, paths)
+    out.append(result("loader", "load", [time.perf_counter() - start], **size))
+    start = time.perf_counter()
+    load_files(conn, paths)
+    out.append(result("loader", "reload", [time.perf_counter() - start], **size))
+    conn.close()
+
+    pool = ConnectionPool(db_file)
+    with pool.connection() as c:
+        (results,) = c.execute("SELECT COUNT(*) FROM results").fetchone()
+        size["results"] = results
+        for r in out:
+            r["results"] = results
+
+        params = query_params(c)
+        for name, query in queries().items():
+            p = params.get(name, ())
+            times = measure(lambda: query(c, p), runs, setup=cold)
+            out.append(result("query", name, times, rows=len(query(c, p)), **size))
+
+        angler = params["angler_performance"][0]
+        sections = {
+            "avg_winning_wt": lambda: avg_winning_wt.chart_data(c),
+            "avg_winning_wt_lake": lambda: avg_winning_wt_lake.chart_data(c),
+            "winning_wt_lake": lambda: winning_wt_lake.chart_data(c),
+            "top_twenty": lambda: top_twenty.top_twenty_results(
+                c,
+                [
+                    max(ids.values())
+                    for ids in top_twenty.tournament_choices(c).values()
+                ],
+            ),
+            "angler_perf": lambda: angler_perf.yearly_averages(
+                queries()["angler_performance"](c, (angler,))
+            ),
+            "leaderboard": lambda: leaderboard.prefetch(c),
+            "search": lambda: search.search(c, angler),
+        }
+        for name, prep in sections.items():
+            out.append(result("section", name, measure(prep, runs, setup=cold), **size))
+
+        df = queries()["all_anglers"](c)
+        start = time.perf_counter()
+        index = NameIndex(df["angler"], df["norm"])
+        out.append(
+            result(
+                "search",
+                "index build",
+                [time.perf_counter() - start],
+                names=len(df),
+                **size,
+            )
+        )
+        terms = search_terms(list(df["angler"]), 60)
+        for method in ["exact", "suggest"]:
+            lookup = getattr(index, method)
+            times = [t for term in terms for t in measure(lambda: lookup(term), 1)]
+            out.append(result("search", method, times, **size))
+    pool.close()
+    return out
+
+
+def bench_parser(runs: int) -> list:
+    corpus = load_corpus()
+    out = []
+    for parser in parsers():
+        times = measure(
+            lambda: [
+                scraper.parse_tournament_results(page, parser) for _, page, _ in corpus
+            ],
+            runs,
+        )
+        out.append(result("parser", parser, times, pages=len(corpus)))
+    return out
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def key(r: dict) -> tuple:
+    return r["group"], r["name"], r.get("tournaments")
+
+
+def print_report(results: list, baseline: list | None) -> None:
+    before = {key(r): r["p50_s"] for r in baseline or []}
+    print(f"{'group':>8} {'name':>22} {'size':>6} {'p50 ms':>10} {'vs base':>8}")
+    for r in results:
+        ratio = ""
+        if key(r) in before:
+            ratio = f"{r['p50_s'] / before[key(r)]:.2f}x"
+        print(
+            f"{r['group']:>8} {r['name']:>22} {r.get('tournaments', ''):>6} "
+            f"{r['p50_s'] * 1000:>10.2f} {ratio:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the loader, every query, every page's data prep, the "
+        "angler search and the scraper parser on synthetic databases."
+    )
+    parser.add_argument("--tournaments", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="a previous report")
+    args = parser.parse_args()
+
+    results = bench_parser(args.runs)
+    for tournaments in args.tournaments:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            write_json(
+                tmp / "data", tournaments, args.seed, anglers=anglers_for(tournaments)
+            )
+            results += bench_size(
+                tmp / "bench.db", tmp / "data", tournaments, args.runs
+            )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "runs": args.runs,
+        "results": results,
+    }
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+    print_report(results, baseline)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
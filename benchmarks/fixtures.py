@@ -0,0 +1,130 @@
+import hashlib
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from synthetic import Generator
+
+
+def year_page(year: int, tournament_ids: list[int]) -> str:
+    links = "\n".join(
+        f'<tr><td><a href="results.cfm?tournament_id={t}&amp;type=team&amp;'
+        f'yearSelected={year}">Event {t}</a></td></tr>'
+        for t in tournament_ids
+    )
+    return f"<html><body><table>\n{links}\n</table></body></html>"
+
+
+def _angler_cell(name: str, hometown: str, listed: bool) -> str:
+    if not listed:
+        return f"<td>{name.upper()}</td>"  # no hometown listed
+    city, state = hometown.rsplit(", ", 1)
+    return (
+        f"<td>{name.upper()}<br>\n"
+        f"<strong>{city}</strong>, <strong>{state}</strong></td>"
+    )
+
+
+def tournament_page(tournament_id: int, year: int, anglers: int = 400) -> str:
+    # A synthetic tournament (see synthetic.py) laid out like a
+    # basschamps.com results page.
+    gen = Generator(seed=tournament_id, anglers=anglers)
+    rng = gen.rng
+    data = gen.tournament(
+        tournament_id, date(year, rng.randint(1, 12), rng.randint(1, 28))
+    )
+    rows = [
+        f'<tr><td class="white" align="right">{k}:</td>'
+        f'<td class="babyBlue">{v}</td></tr>'
+        for k, v in data["metadata"].items()
+    ]
+    rows.append(
+        "<tr><td>Place</td><td>Boat</td><td></td><td>Angler</td><td>Angler</td>"
+        "<td>Fish</td><td>Big Bass</td><td>Wt.</td><td>Prize</td></tr>"
+    )
+    for r in data["results"]:
+        boat = "skeeter.gif" if r["skeeter_boat"] else "other.gif"
+        prize = f"{r['prize']}&nbsp;" if r["prize"] else ""
+        rows.append(
+            f'<tr><td>{r["place"]}</td><td><img src="images/{boat}"></td>'
+            "<td>&nbsp;</td>"
+            f"{_angler_cell(r['angler1'], r['angler1_hometown'], rng.random() >= 0.1)}"
+            f"{_angler_cell(r['angler2'], r['angler2_hometown'], rng.random() >= 0.1)}"
+            f"<td>{r['fish']}</td><td>{r['big bass']:.2f}</td>"
+            f"<td>{r['Wt.']:.2f}</td><td>{prize}</td></tr>"
+        )
+    body = "\n".join(rows)
+    return f'<html><body><table width="100%">\n{body}\n</table></body></html>'
+
+
+def build_site(
+    min_year: int = 2006, max_year: int = 2026, per_year: int = 10
+) -> dict[tuple[str, str], str]:
+    # Keyed on (page, id) where id is the year or the tournament id.
+    site = {}
+    t_id = 1000
+    for year in range(min_year, max_year):
+        ids = list(range(t_id, t_id + per_year))
+        t_id += per_year
+        site[("resultsIntro.cfm", str(year))] = year_page(year, ids)
+        for t in ids:
+            site[("results.cfm", str(t))] = tournament_page(t, year)
+    return site
+
+
+class FixtureServer:
+    # Local stand-in for basschamps.com serving build_site() pages, with an
+    # optional per-request latency to mimic a real round trip.
+    def __init__(self, site: dict, latency: float = 0.0):
+        self.site = site
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.paths: list[str] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                server.paths.append(self.path)
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                key = query.get(
+                    "yearSelected" if "Intro" in url.path else "tournament_id"
+                )
+                page = server.site.get((url.path.lstrip("/"), key[0] if key else ""))
+                if page is None:
+                    self.send_error(404)
+                    return
+                body = page.encode("utf-8")
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,223 @@
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from lakes import LAKES  # noqa: E402
+from loader import load_files  # noqa: E402
+
+FIRST = [
+    "John", "Robert", "William", "James", "Michael", "David", "Richard", "Thomas",
+    "Charles", "Daniel", "Matthew", "Anthony", "Mark", "Steven", "Paul", "Kevin",
+    "Brian", "Jason", "Travis", "Cody", "Dustin", "Kyle", "José", "Juan", "Luis",
+    "Billy Joe", "T.J.", "J.R.", "Bubba", "Dwayne",
+]  # fmt: skip
+LAST = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Taylor",
+    "Moore", "Jackson", "Martin", "Lee", "Thompson", "White", "Harris", "Clark",
+    "Lewis", "Walker", "Hall", "Young", "King", "Wright", "Nguyen", "O'Neil",
+    "McDonald", "Peña", "Van Dam", "St. John",
+]  # fmt: skip
+NICKNAMES = {
+    "Robert": "Bob", "William": "Bill", "James": "Jim", "Michael": "Mike",
+    "Richard": "Rick", "Thomas": "Tom", "Charles": "Chuck", "Daniel": "Danny",
+    "Matthew": "Matt", "Anthony": "Tony", "Steven": "Steve",
+}  # fmt: skip
+CITIES = [
+    ("Austin", "TX"), ("Waco", "TX"), ("Tyler", "TX"), ("Temple", "TX"),
+    ("Conroe", "TX"), ("Lufkin", "TX"), ("Emory", "TX"), ("Round Rock", "TX"),
+    ("San Antonio", "TX"), ("Fort Worth", "TX"), ("Durant", "OK"),
+    ("Shreveport", "LA"),
+]  # fmt: skip
+EVENTS = ["Team Classic", "Open", "Team Championship", "Fall Classic", "Invitational"]
+UNNAMED = ["Mystery Pond Classic", "Big Bass Bash", "Season Opener"]
+TRAILS = ["Central", "North Texas", "South Texas", "East Texas"]
+REGIONS = ["North", "Central", "South", "East"]
+
+
+def _zipf_cum_weights(n: int, s: float) -> list[float]:
+    # Cumulative, so each draw is a bisect rather than a pass over n weights.
+    return list(accumulate(1 / (rank**s) for rank in range(1, n + 1)))
+
+
+class Generator:
+    # Deterministic for a seed. Lakes and anglers are drawn with Zipf weights,
+    # so a few lakes host most events and a core of regulars fish most of
+    # them; about one appearance in eight spells the angler's name
+    # differently (nickname, case, middle initial, suffix, spacing).
+    def __init__(self, seed: int = 0, anglers: int = 4000, variant_rate: float = 0.12):
+        self.rng = random.Random(seed)
+        self.variant_rate = variant_rate
+        self.lakes = list(LAKES)
+        self.rng.shuffle(self.lakes)
+        self.lake_weights = _zipf_cum_weights(len(self.lakes), 1.0)
+        # Each lake fishes a little heavier or lighter than the rest.
+        self.lake_bias = {a: self.rng.uniform(0.8, 1.25) for a in self.lakes}
+        self.anglers = [self._angler() for _ in range(anglers)]
+        self.angler_ids = range(anglers)
+        self.angler_weights = _zipf_cum_weights(anglers, 0.8)
+
+    def _angler(self) -> tuple[str, str, str]:
+        city, state = self.rng.choice(CITIES)
+        return self.rng.choice(FIRST), self.rng.choice(LAST), f"{city}, {state}"
+
+    def _spelling(self, first: str, last: str) -> str:
+        rng = self.rng
+        if rng.random() >= self.variant_rate:
+            return f"{first} {last}"
+        variant = rng.randrange(5)
+        if variant == 0 and first in NICKNAMES:
+            return f"{NICKNAMES[first]} {last}"
+        if variant == 1:
+            return f"{first} {last}".upper()
+        if variant == 2:
+            return f"{first} {rng.choice('ABCDEJLMRW')}. {last}"
+        if variant == 3:
+            return f"{first} {last} {rng.choice(['Jr.', 'Sr.', 'III'])}"
+        return f"{first}  {last} "
+
+    def _team(self, used: set) -> list:
+        ids, weights = self.angler_ids, self.angler_weights
+        cols = []
+        for _ in range(2):
+            while True:
+                i = self.rng.choices(ids, cum_weights=weights)[0]
+                if i not in used:
+                    break
+            used.add(i)
+            first, last, hometown = self.anglers[i]
+            cols += [self._spelling(first, last), hometown]
+        return cols
+
+    def tournament(self, n: int, day: date) -> dict:
+        rng = self.rng
+        if rng.random() < 0.03:
+            alias, name = None, f"{rng.choice(UNNAMED)} {n}"
+        else:
+            alias = rng.choices(self.lakes, cum_weights=self.lake_weights)[0]
+            name = f"{alias.title()} {rng.choice(EVENTS)} {n}"
+        bias = self.lake_bias.get(alias, 1.0)
+        # Every angler fishes at most once per tournament, so a small pool
+        # caps the field.
+        teams = min(
+            len(self.anglers) // 2, max(10, min(250, int(rng.lognormvariate(3.7, 0.5))))
+        )
+        weight = rng.uniform(18, 28) * bias
+        used: set = set()
+        results = []
+        for place in range(1, teams + 1):
+            weight = max(0.0, weight - rng.expovariate(4.0))
+            angler1, home1, angler2, home2 = self._team(used)
+            zeroed = weight == 0 or rng.random() < 0.02
+            results.append(
+                {
+                    "place": place,
+                    "skeeter_boat": rng.random() < 0.6,
+                    "angler1": angler1,
+                    "angler1_hometown": home1,
+                    "angler2": angler2,
+                    "angler2_hometown": home2,
+                    "fish": 0 if zeroed else rng.randint(1, 5),
+                    "big bass": 0.0 if zeroed else round(rng.uniform(2, 10), 2),
+                    "Wt.": 0.0 if zeroed else round(weight, 2),
+                    "prize": f"${max(0, 5000 - place * 150):,}"
+                    if place <= teams // 3
+                    else "",
+                }
+            )
+        return {
+            "metadata": {
+                "Date": f"{day:%B} {day.day}, {day.year}",
+                "Region": rng.choice(REGIONS),
+                "Tournament": name,
+                "Tournament Trail": rng.choice(TRAILS),
+            },
+            "results": results,
+        }
+
+    def tournaments(self, count: int, min_year: int = 2006, max_year: int = 2026):
+        # Spread evenly over the years, on weekend dates.
+        span = (date(max_year, 1, 1) - date(min_year, 1, 1)).days
+        for n in range(count):
+            day = date(min_year, 1, 1) + timedelta(days=span * n // count)
+            day += timedelta(days=(5 - day.weekday()) % 7)
+            yield self.tournament(n, day)
+
+
+def write_json(data_dir, count: int, seed: int = 0, **kwargs) -> list[Path]:
+    # One file per tournament, as the scraper saves them.
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for n, data in enumerate(Generator(seed, **kwargs).tournaments(count)):
+        path = data_dir / f"tournament_{n}.json"
+        with open(path, mode="w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        paths.append(path)
+    return paths
+
+
+def write_bundle(path, count: int, seed: int = 0, **kwargs) -> Path:
+    path = Path(path)
+    with open(path, mode="w", encoding="utf-8") as f:
+        for data in Generator(seed, **kwargs).tournaments(count):
+            f.write(json.dumps(data) + "\n")
+    return path
+
+
+def build_db(db_file, count: int, seed: int = 0, workers: int | None = None, **kwargs):
+    # Loads the corpus through the real loader, so the summary and angler
+    # tables are built exactly as in production.
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = write_bundle(Path(tmp) / "synthetic.ndjson", count, seed, **kwargs)
+        conn = sqlite3.connect(db_file, isolation_level=None)
+        try:
+            return load_files(conn, [bundle], workers=workers)
+        finally:
+            conn.close()
+
+
+def anglers_for(tournaments: int) -> int:
+    # A regional trail: the pool grows with the schedule but most teams are
+    # regulars, so each angler fishes several events.
+    return max(200, tournaments * 12)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic tournament database and/or JSON corpus."
+    )
+    parser.add_argument("--tournaments", type=int, default=2500)
+    parser.add_argument("--db", type=Path)
+    parser.add_argument("--data-dir", type=Path)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--anglers", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    if not args.db and not args.data_dir:
+        parser.error("give --db and/or --data-dir")
+
+    anglers = args.anglers or anglers_for(args.tournaments)
+    if args.data_dir:
+        paths = write_json(args.data_dir, args.tournaments, args.seed, anglers=anglers)
+        print(f"wrote {len(paths)} files to {args.data_dir}")
+    if args.db:
+        if args.db.exists():
+            parser.error(f"{args.db} already exists")
+        loaded = build_db(
+            args.db, args.tournaments, args.seed, args.workers, anglers=anglers
+        )
+        print(f"loaded {len(loaded)} tournaments into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import threading
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING
+
+from cachetools import TTLCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_TTL = 60 * 60
+
+
+def frame_bytes(df: "pd.DataFrame") -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class QueryCache:
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL):
+        self._cache = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=frame_bytes)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(
+        self, key: Hashable, load: Callable[[], "pd.DataFrame"]
+    ) -> "pd.DataFrame":
+        with self._lock:
+            df = self._cache.get(key)
+            self._local.hit = df is not None
+            if df is not None:
+                self.hits += 1
+                return df.copy()
+            self.misses += 1
+        df = load()
+        with self._lock:
+            try:
+                self._cache[key] = df
+            except ValueError:  # larger than the whole cache, don't keep it
+                pass
+        return df.copy()
+
+    def last_hit(self) -> bool | None:
+        # Whether this thread's last get_or_load was served from the cache.
+        return getattr(self._local, "hit", None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._cache),
+                "bytes": self._cache.currsize,
+                "max_bytes": self._cache.maxsize,
+            }
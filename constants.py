@@ -1,4 +1,9 @@
 import streamlit as st
 
 PLACES = ["🥇 1st", "🥈 2nd", "🥉 3rd"]
-TEXT_COLOR = "white" if st.get_option("theme.base") in ["dark", None] else "grey"
+
+
+def text_color() -> str:
+    # Read when a chart is built rather than at import, so importing this
+    # module doesn't touch Streamlit's config.
+    return "white" if st.get_option("theme.base") in ["dark", None] else "grey"
@@ -1,25 +1,182 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from functools import wraps
-from sqlite3 import Connection, connect
+from pathlib import Path
+from queue import Empty, Queue
+from sqlite3 import Connection
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import perf
+from cache import QueryCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DB_FILE = Path(
+    os.environ.get("TD_DB", Path(__file__).resolve().parent / "tournaments.db")
+)
+BACKEND = os.environ.get("TD_BACKEND", "sqlite")  # or "arrow", see snapshot.py
+POOL_SIZE = 8
+POOL_TIMEOUT = 10.0
+READ_PRAGMAS = {
+    "query_only": "ON",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # negative => KiB, i.e. 64 MiB per connection
+    "temp_store": "MEMORY",
+}
+
+
+class PoolTimeout(RuntimeError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, database=DB_FILE, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.database = Path(database)
+        self.size = size
+        self.timeout = timeout
+        self._idle: Queue[Connection] = Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _open(self) -> Connection:
+        c = sqlite3.connect(
+            f"{self.database.as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        for pragma, value in READ_PRAGMAS.items():
+            c.execute(f"PRAGMA {pragma} = {value}")
+        return c
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._opened >= self.size:
+                return False
+            self._opened += 1
+            return True
+
+    def acquire(self) -> Connection:
+        start = time.perf_counter()
+        try:
+            c = self._idle.get_nowait()
+        except Empty:
+            if self._reserve():
+                try:
+                    c = self._open()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    c = self._idle.get(timeout=self.timeout)
+                except Empty:
+                    raise PoolTimeout(
+                        f"No connection available after {self.timeout}s"
+                    ) from None
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        if perf.ENABLED:
+            perf.record("pool", "acquire", waited)
+        return c
+
+    def release(self, c: Connection) -> None:
+        self._idle.put_nowait(c)
+
+    @contextmanager
+    def connection(self):
+        c = self.acquire()
+        try:
+            yield c
+        finally:
+            self.release(c)
+
+    def health_check(self) -> bool:
+        try:
+            with self.connection() as c:
+                c.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            return True
+        except (sqlite3.Error, PoolTimeout):
+            return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "opened": self._opened,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "wait_total_s": self._wait_total,
+                "wait_max_s": self._wait_max,
+                "wait_avg_s": self._wait_total / self._checkouts
+                if self._checkouts
+                else 0.0,
+            }
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
 
 
 def db_conn(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        c: Connection = connect(database="tournaments.db")
-        try:
+        with get_pool().connection() as c:
             return func(c, *args, **kwargs)
-        finally:
-            c.close()
 
     return wrapper
 
 
-def load_query(filename: str) -> str:
-    with open(filename, mode="r", encoding="utf-8") as f:
-        return f.read()
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def db_version(c: Connection) -> tuple:
+    # The file mtimes catch in-place updates (e.g. lake backfills), the max id
+    # catches loads still sitting in the WAL.
+    path = next(row[2] for row in c.execute("PRAGMA database_list") if row[1] == "main")
+    (max_id,) = c.execute("SELECT MAX(id) FROM tournaments").fetchone()
+    return _mtime_ns(path), _mtime_ns(f"{path}-wal"), max_id
+
+
+QUERY_CACHE = QueryCache()
+
 
+def read_sql(c: Connection, sql: str, params=()) -> "pd.DataFrame":
+    # pandas is imported on the first query rather than at startup.
+    import pandas as pd
 
-def load_data(c: Connection, q_file: str) -> pd.DataFrame:
-    return pd.read_sql_query(load_query(q_file), c)
+    params = tuple(params)
+    return QUERY_CACHE.get_or_load(
+        (sql, params, db_version(c)),
+        lambda: pd.read_sql_query(sql, c, params=params),
+    )
@@ -0,0 +1,133 @@
+import json
+import re
+from collections.abc import Iterable
+from sqlite3 import Connection
+
+# Alias (lowercase substring of the tournament name) -> lake.
+LAKES = {
+    "amistad": "Lake Amistad",
+    "belton": "Lake Belton",
+    "cedar creek": "Cedar Creek Reservoir",
+    "choke": "Choke Canyon Reservoir",
+    "buchanan": "Lake Buchanan",
+    "falcon": "Lake Falcon",
+    "fork": "Lake Fork",
+    "lbj": "Lake LBJ",
+    "lewisville": "Lake Lewisville",
+    "ivie": "O.H. Ivie Reservoir",
+    "ray roberts": "Lake Ray Roberts",
+    "sam rayburn": "Sam Rayburn Reservoir",
+    "tawakoni": "Lake Tawakoni",
+    "travis": "Lake Travis",
+    "toledo": "Toledo Bend Reservoir",
+    "whitney": "Lake Whitney",
+    "red river": "The Red River",
+    "arbuckle": "Lake Arbuckle",
+    "texoma": "Lake Texoma",
+    "richland": "Richland-Chambers Reservoir",
+    "sabine": "The Sabine River",
+    "eagle": "Eagle Mountain Lake",
+    "limestone": "Lake Limestone",
+    "squaw": "Squaw Creek",
+}
+
+# Tournaments whose names don't say where they were fished, by date. Seeds
+# the lake_overrides table (see schema.py); add new ones with
+# scripts/null_lakes.py --set.
+OVERRIDE_SEED = {
+    "Lake LBJ": ["2012-09-29"],
+    "Lake Fork": ["2023-06-25", "2010-08-28"],
+    "Squaw Creek": ["2015-12-13"],
+    "Lake Belton": ["2011-09-10"],
+    "Lake Falcon": ["2012-10-27", "2011-10-08"],
+    "Lake Texoma": ["2023-10-14", "2019-10-12", "2024-10-12"],
+    "Lake Whitney": [
+        "2010-05-30",
+        "2011-05-29",
+        "2008-05-25",
+        "2022-10-08",
+        "2012-05-27",
+    ],
+    "The Red River": ["2015-10-10", "2013-10-05", "2014-10-11", "2020-10-10"],
+    "Lake Arbuckle": ["2009-10-23"],
+    "Lake Limestone": ["2006-10-07"],
+    "Lake Lewisville": ["2012-09-15"],
+    "The Sabine River": ["2016-10-08"],
+    "O.H. Ivie Reservoir": ["2010-10-02", "2009-10-03", "2021-10-09"],
+    "Eagle Mountain Lake": ["2008-10-18"],
+    "Toledo Bend Reservoir": ["2010-10-09", "2012-09-08", "2018-02-17"],
+    "Sam Rayburn Reservoir": [
+        "2015-06-28",
+        "2022-06-26",
+        "2007-10-27",
+        "2011-10-01",
+        "2006-05-21",
+        "2019-06-22",
+        "2020-06-28",
+        "2017-06-25",
+        "2018-06-23",
+        "2016-06-26",
+        "2021-09-12",
+    ],
+    "Cedar Creek Reservoir": ["2011-09-17", "2009-10-10"],
+}
+
+OVERRIDE_DDL = """
+CREATE TABLE IF NOT EXISTS lake_overrides (
+    date TEXT PRIMARY KEY,
+    lake TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def _compile(aliases: Iterable[str]) -> re.Pattern:
+    # Longer aliases first, so at any position the longest one wins.
+    return re.compile(
+        "|".join(re.escape(a) for a in sorted(aliases, key=lambda a: (-len(a), a)))
+    )
+
+
+_PATTERN = _compile(LAKES)
+
+
+def resolve_lake(tournament: str | None) -> str | None:
+    # The alias that starts first in the name, the longest one if several
+    # start there. One regex pass instead of a substring test per alias.
+    m = _PATTERN.search((tournament or "").lower())
+    return LAKES[m[0]] if m else None
+
+
+def seed_overrides(conn: Connection) -> None:
+    conn.execute(OVERRIDE_DDL)
+    conn.executemany(
+        "INSERT OR IGNORE INTO lake_overrides (date, lake) VALUES (?, ?)",
+        ((date, lake) for lake, dates in OVERRIDE_SEED.items() for date in dates),
+    )
+
+
+def set_override(conn: Connection, date: str, lake: str) -> None:
+    conn.execute(
+        "INSERT INTO lake_overrides (date, lake) VALUES (?, ?) "
+        "ON CONFLICT (date) DO UPDATE SET lake = excluded.lake",
+        (date, lake),
+    )
+
+
+def apply_overrides(conn: Connection, tournament_ids=None) -> list[int]:
+    # Fills in the lake of tournaments without one from lake_overrides, all
+    # of them or just the given ids, and returns the ids it changed.
+    where = ""
+    params = ()
+    if tournament_ids is not None:
+        where = "AND tournaments.id IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(list(tournament_ids)),)
+    rows = conn.execute(
+        f"""
+        UPDATE tournaments SET lake = o.lake
+        FROM lake_overrides o
+        WHERE tournaments.date = o.date AND tournaments.lake IS NULL {where}
+        RETURNING tournaments.id
+        """,
+        params,
+    ).fetchall()
+    return [t_id for (t_id,) in rows]
@@ -0,0 +1,305 @@
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from sqlite3 import Connection
+
+from anglers import delete_anglers, link_anglers, orphaned_anglers, unlink_anglers
+from lakes import apply_overrides, resolve_lake
+from ratings import delete_ratings, update_ratings
+from schema import analyze, migrate
+from search import add_results, remove_results, unindex_anglers
+from summary import refresh_summaries
+
+logger = logging.getLogger(__name__)
+
+BATCH_FILES = 500
+DECODE_CHUNK = 64  # files or bundle lines per decode task
+# Below this much JSON, decoding in-process beats starting a pool (about
+# 500 scraped files, a few tenths of a second to decode).
+POOL_MIN_BYTES = 8 << 20
+BUNDLE_SUFFIXES = {".ndjson", ".jsonl"}  # one tournament JSON object per line
+LOAD_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # WAL stays consistent; only the last commit is at risk
+    "foreign_keys": "ON",
+}
+
+_UPSERT_TOURNAMENT = """
+INSERT INTO tournaments (id, date, lake, region, tournament, tournament_trail)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (date, tournament) DO UPDATE SET
+    lake = COALESCE(excluded.lake, lake),  -- keep lakes backfilled by hand
+    region = excluded.region,
+    tournament_trail = excluded.tournament_trail
+"""
+_INSERT_RESULT = """
+INSERT INTO results (
+    tournament_id, place, skeeter_boat, angler1, angler1_hometown,
+    angler2, angler2_hometown, fish, big_bass, weight, prize
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class LoadError(ValueError):
+    pass
+
+
+def parse_tournament(data: dict) -> tuple[tuple, list[tuple]]:
+    # -> ((date, lake, region, tournament, trail), [result row, ...])
+    metadata = data.get("metadata") or {}
+    name = metadata.get("Tournament")
+    if not name or not metadata.get("Date"):
+        raise LoadError("missing tournament name or date")
+    date = datetime.strptime(metadata["Date"], "%B %d, %Y").date().isoformat()
+    tournament = (
+        date,
+        resolve_lake(name),
+        metadata.get("Region"),
+        name,
+        metadata.get("Tournament Trail"),
+    )
+    results = [
+        (
+            r.get("place"),
+            r.get("skeeter_boat"),
+            r.get("angler1"),
+            r.get("angler1_hometown"),
+            r.get("angler2"),
+            r.get("angler2_hometown"),
+            r.get("fish"),
+            r.get("big bass"),
+            r.get("Wt."),
+            r.get("prize"),
+        )
+        for r in data.get("results", [])
+    ]
+    return tournament, results
+
+
+def read_tournament(path) -> tuple[tuple, list[tuple]]:
+    with open(path, encoding="utf-8") as f:
+        return parse_tournament(json.load(f))
+
+
+def _decode_chunk(chunk: list[tuple[str, str | None]]) -> list:
+    # Runs in the decode workers. Each item is (source, line) for a bundle
+    # line or (path, None) for a file read here; bad items come back as a
+    # LoadError instead of failing the whole chunk.
+    out = []
+    for source, line in chunk:
+        try:
+            if line is None:
+                out.append(read_tournament(source))
+            else:
+                out.append(parse_tournament(json.loads(line)))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            out.append(LoadError(f"{source}: {e}"))
+    return out
+
+
+def _chunks(paths: Iterable, size: int):
+    # Bundles are streamed a chunk of lines at a time; single files are
+    # grouped by path and opened by the workers.
+    chunk = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix not in BUNDLE_SUFFIXES:
+            chunk.append((str(path), None))
+        else:
+            with open(path, encoding="utf-8") as f:
+                for n, line in enumerate(f, start=1):
+                    if line.strip():
+                        chunk.append((f"{path}:{n}", line))
+                    if len(chunk) >= size:
+                        yield chunk
+                        chunk = []
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _total_bytes(paths: list[Path]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass  # reported by the decode as a LoadError
+    return total
+
+
+def decode_files(paths: Iterable, workers: int | None = None):
+    # Yields (tournament, results) for every file and bundle line, in input
+    # order, decoded by a process pool. At most a few chunks per worker are
+    # in flight, so a huge data directory is never held in memory at once.
+    # Without an explicit worker count, small loads and single-CPU machines
+    # decode in this process.
+    if not workers:
+        paths = [Path(p) for p in paths]
+        workers = os.cpu_count() or 1
+        if workers > 1 and _total_bytes(paths) < POOL_MIN_BYTES:
+            workers = 1
+    if workers == 1:
+        decoded = map(_decode_chunk, _chunks(paths, DECODE_CHUNK))
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        decoded = _bounded_map(pool, _chunks(paths, DECODE_CHUNK), workers * 2)
+    try:
+        for chunk in decoded:
+            for item in chunk:
+                if isinstance(item, LoadError):
+                    logger.warning(f"Skipping {item}")
+                else:
+                    yield item
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _bounded_map(pool, items, window: int):
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(_decode_chunk, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _next_id(conn: Connection) -> int:
+    # AUTOINCREMENT never hands out an id twice, even after deletes, so
+    # continue from sqlite_sequence rather than MAX(id).
+    row = conn.execute(
+        """
+        SELECT MAX(
+            COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tournaments'), 0),
+            COALESCE((SELECT MAX(id) FROM tournaments), 0)
+        )
+        """
+    ).fetchone()
+    return row[0] + 1
+
+
+def _write_batch(
+    conn: Connection, batch: list, replaced: list[int], moved: list[int]
+) -> None:
+    # batch holds (id, tournament, results); runs inside the caller's
+    # transaction.
+    unlinked = []
+    if replaced:
+        remove_results(conn, replaced)
+        unlinked = unlink_anglers(conn, replaced)
+        conn.execute(
+            "DELETE FROM results WHERE tournament_id IN "
+            "(SELECT value FROM json_each(?))",
+            (json.dumps(replaced),),
+        )
+        # Settle the summary groups of reloads that move to another lake
+        # before the upsert moves them.
+        refresh_summaries(conn, moved)
+    conn.executemany(_UPSERT_TOURNAMENT, ((t_id, *t) for t_id, t, _ in batch))
+    apply_overrides(conn, [t_id for t_id, _, _ in batch])
+    conn.executemany(
+        _INSERT_RESULT,
+        ((t_id, *r) for t_id, _, results in batch for r in results),
+    )
+    link_anglers(conn, [t_id for t_id, _, _ in batch])
+    add_results(conn, [t_id for t_id, _, _ in batch])
+    # Anglers whose only results were reloaded under another name. Their
+    # ratings go too; a reload always replays the ratings afterwards.
+    orphans = orphaned_anglers(conn, unlinked)
+    if orphans:
+        unindex_anglers(conn, orphans)
+        delete_ratings(conn, orphans)
+        delete_anglers(conn, orphans)
+
+
+def load_files(
+    conn: Connection,
+    paths: Iterable,
+    batch_size: int = BATCH_FILES,
+    replace: bool = False,
+    workers: int | None = None,
+) -> list[int]:
+    # Loads tournament JSON files and bundles and returns the ids written.
+    # Decoding runs in worker processes (decode_files); the calling thread is
+    # the only one writing to the database. Tournaments
+    # already in the database are skipped, or reloaded in place (same id,
+    # fresh results) with replace=True, so running a load twice is a no-op.
+    # Each batch of files is one transaction (results, angler links and the
+    # search index together), so readers never see a half-loaded tournament;
+    # the summary and rating tables catch up in last transactions.
+    # conn must be in autocommit mode (isolation_level=None).
+    for pragma, value in LOAD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    migrate(conn)
+    existing = {
+        (date, name): (t_id, lake)
+        for t_id, date, name, lake in conn.execute(
+            "SELECT id, date, tournament, lake FROM tournaments"
+        )
+    }
+    next_id = _next_id(conn)
+    loaded, seen = [], set()
+    batch, replaced, moved = [], [], []
+
+    def _transaction(write, *args):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            write(conn, *args)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _flush():
+        _transaction(_write_batch, batch, replaced, moved)
+        loaded.extend(t_id for t_id, _, _ in batch)
+        batch.clear()
+        replaced.clear()
+        moved.clear()
+
+    for tournament, results in decode_files(paths, workers):
+        key = (tournament[0], tournament[3])
+        if key in seen:
+            continue  # the same tournament saved twice
+        seen.add(key)
+        if key not in existing:
+            t_id = next_id
+            next_id += 1
+        elif replace:
+            t_id, lake = existing[key]
+            replaced.append(t_id)
+            if tournament[1] not in (None, lake):
+                moved.append(t_id)
+        else:
+            continue
+        batch.append((t_id, tournament, results))
+        if len(batch) >= batch_size:
+            _flush()
+    if batch:
+        _flush()
+    # Most batches touch most (year, lake) groups, so recompute the summary
+    # once for the whole load rather than per batch. Ratings go in date
+    # order, so they too wait for the whole load.
+    _transaction(refresh_summaries, loaded)
+    _transaction(update_ratings, loaded)
+    if loaded:
+        analyze(conn)
+    return loaded
+
+
+def tournament_files(data_dir) -> list[Path]:
+    return sorted(
+        p
+        for p in Path(data_dir).iterdir()
+        if p.suffix == ".json" or p.suffix in BUNDLE_SUFFIXES
+    )
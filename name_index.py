@@ -0,0 +1,157 @@
+import threading
+from collections.abc import Iterable
+from difflib import SequenceMatcher
+from sqlite3 import Connection
+
+import numpy as np
+
+from db import db_version
+from names import normalize_name
+from registry import get_query
+
+
+def _trigram_codes(norms: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    # Pack every trigram of every padded name into an int so the whole corpus
+    # is indexed with array ops; returns (owner ids, codes), deduplicated.
+    padded = [f"  {n} " for n in norms]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    buf = np.frombuffer("".join(padded).encode("ascii", "replace"), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(padded)), lengths - 2)
+    pos = np.arange(len(owner)) + 2 * owner  # skip the 2 positions per name that wrap
+    codes = (
+        buf[pos].astype(np.int64) << 16
+        | buf[pos + 1].astype(np.int64) << 8
+        | buf[pos + 2]
+    )
+    keys = np.unique(owner << 24 | codes)
+    return keys >> 24, keys & 0xFFFFFF
+
+
+class NameIndex:
+    def __init__(self, names: Iterable[str], norms: Iterable[str] | None = None):
+        names = list(names)
+        norms = list(norms) if norms is not None else [normalize_name(n) for n in names]
+        by_norm: dict[str, list[str]] = {}
+        for name, norm in zip(names, norms):
+            if norm:
+                by_norm.setdefault(norm, []).append(name)
+        self._norms = sorted(by_norm)
+        self._names = [
+            v if len(v) == 1 else sorted(v)
+            for v in map(by_norm.__getitem__, self._norms)
+        ]
+        self._ids = {norm: i for i, norm in enumerate(self._norms)}
+
+        # Every word start of every name, so "smi" completes "john smith".
+        suffixes, suffix_ids = [], []
+        for i, norm in enumerate(self._norms):
+            suffixes.append(norm)
+            suffix_ids.append(i)
+            pos = norm.find(" ")
+            while pos != -1:
+                suffixes.append(norm[pos + 1 :])
+                suffix_ids.append(i)
+                pos = norm.find(" ", pos + 1)
+        suffixes = np.array(suffixes)
+        order = np.argsort(suffixes, kind="stable")
+        self._suffixes = suffixes[order]
+        self._suffix_ids = np.array(suffix_ids, dtype=np.int64)[order]
+
+        # Trigram postings in CSR form: ids of names containing _grams[k] are
+        # _posting_ids[_posting_starts[k]:_posting_starts[k + 1]].
+        owner, codes = _trigram_codes(self._norms)
+        order = np.argsort(codes, kind="stable")
+        self._grams, first = np.unique(codes[order], return_index=True)
+        self._posting_starts = np.append(first, len(order))
+        self._posting_ids = owner[order]
+        self._sizes = np.bincount(owner, minlength=len(self._norms))
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def exact(self, query: str) -> list[str]:
+        i = self._ids.get(normalize_name(query))
+        return [] if i is None else list(self._names[i])
+
+    def _complete_ids(self, norm: str, limit: int) -> list[int]:
+        lo, hi = np.searchsorted(self._suffixes, [norm, norm + "\x7f"])
+        ids: list[int] = []
+        for i in self._suffix_ids[lo:hi]:
+            if len(ids) >= limit:
+                break
+            if i not in ids:
+                ids.append(int(i))
+        return ids
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        norm = normalize_name(prefix)
+        if not norm:
+            return []
+        return [n for i in self._complete_ids(norm, limit) for n in self._names[i]]
+
+    def _fuzzy_ids(self, norm: str, limit: int, min_score: float) -> list[tuple]:
+        _, query_grams = _trigram_codes([norm])
+        if not len(self._grams):
+            return []
+        slots = np.searchsorted(self._grams, query_grams)
+        slots = np.minimum(slots, len(self._grams) - 1)
+        slots = slots[self._grams[slots] == query_grams]
+        if not len(slots):
+            return []
+        hits = np.concatenate(
+            [
+                self._posting_ids[self._posting_starts[k] : self._posting_starts[k + 1]]
+                for k in slots
+            ]
+        )
+        # Only names sharing a third of the query's trigrams can score well.
+        candidates, shared = np.unique(hits, return_counts=True)
+        keep = shared >= max(1, len(query_grams) // 3)
+        candidates, shared = candidates[keep], shared[keep]
+        dice = 2 * shared / (self._sizes[candidates] + len(query_grams))
+        if len(dice) > limit * 4:
+            top = np.argpartition(dice, -limit * 4)[-limit * 4 :]
+            candidates = candidates[top]
+        scored = [
+            (i, SequenceMatcher(None, norm, self._norms[i]).ratio()) for i in candidates
+        ]
+        scored.sort(key=lambda x: (-x[1], self._norms[x[0]]))
+        return [(int(i), s) for i, s in scored[:limit] if s >= min_score]
+
+    def fuzzy(
+        self, query: str, limit: int = 10, min_score: float = 0.6
+    ) -> list[tuple[str, float]]:
+        norm = normalize_name(query)
+        if not norm:
+            return []
+        return [
+            (n, score)
+            for i, score in self._fuzzy_ids(norm, limit, min_score)
+            for n in self._names[i]
+        ]
+
+    def suggest(self, query: str, limit: int = 10) -> list[str]:
+        norm = normalize_name(query)
+        if not norm:
+            return []
+        ids = self._complete_ids(norm, limit)
+        for i, _ in self._fuzzy_ids(norm, limit, min_score=0.6):
+            if len(ids) >= limit:
+                break
+            if i not in ids:
+                ids.append(i)
+        return [n for i in ids for n in self._names[i]]
+
+
+_index: tuple[tuple, NameIndex] | None = None
+_index_lock = threading.Lock()
+
+
+def get_name_index(c: Connection) -> NameIndex:
+    global _index
+    version = db_version(c)
+    with _index_lock:
+        if _index is None or _index[0] != version:
+            df = get_query("all_anglers")(c)
+            _index = (version, NameIndex(df["angler"], df["norm"]))
+        return _index[1]
@@ -0,0 +1,13 @@
+import string
+import unicodedata
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+def normalize_name(name: str) -> str:
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    name = name.lower().translate(_PUNCTUATION)
+    parts = name.split()
+    if len(parts) == 3 and len(parts[1]) == 1:  # Remove middle initial
+        parts.pop(1)
+    return " ".join(parts)
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from pathlib import Path
+
+# Off unless TD_PERF=1. When off, section() hands back the function itself and
+# callers check ENABLED before record(), so normal reruns pay nothing.
+ENABLED = os.environ.get("TD_PERF") == "1"
+# Optional JSON-lines file every record is appended to, for offline analysis.
+LOG_FILE = os.environ.get("TD_PERF_LOG")
+RING_SIZE = 4096
+
+# Shared by every session of the server process, so the percentiles cover all
+# of them.
+_records: deque[dict] = deque(maxlen=RING_SIZE)
+_lock = threading.Lock()
+_local = threading.local()
+_log = None
+
+
+def _write_log(line: str) -> None:
+    global _log
+    if _log is None:
+        path = Path(LOG_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _log = open(path, "a", encoding="utf-8", buffering=1)
+    _log.write(line + "\n")
+
+
+def record(kind: str, name: str, seconds: float, **fields) -> None:
+    # kind is "section", "query" or "pool"; fields are rows, bytes, cache_hit.
+    rec = {
+        "ts": time.time(),
+        "kind": kind,
+        "name": name,
+        "section": getattr(_local, "section", None),
+        "seconds": seconds,
+        **fields,
+    }
+    with _lock:
+        _records.append(rec)
+        if LOG_FILE:
+            _write_log(json.dumps(rec))
+
+
+def section(func):
+    # Times a page's show(); queries run inside it are tagged with its name.
+    if not ENABLED:
+        return func
+    name = func.__module__.rpartition(".")[2]
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_local, "section", None)
+        _local.section = name
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            _local.section = outer
+            record("section", name, seconds)
+
+    return wrapper
+
+
+def records() -> list[dict]:
+    with _lock:
+        return list(_records)
+
+
+def clear() -> None:
+    with _lock:
+        _records.clear()
+
+
+def percentile(values: list[float], p: float) -> float:
+    # Nearest rank on already sorted values.
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+def _max_field(group: list[dict], field: str):
+    values = [r[field] for r in group if r.get(field) is not None]
+    return max(values) if values else None
+
+
+def summarize(recs: list[dict]) -> list[dict]:
+    # One row per (kind, name), slowest p95 first.
+    groups: dict[tuple, list[dict]] = {}
+    for rec in recs:
+        groups.setdefault((rec["kind"], rec["name"]), []).append(rec)
+    rows = []
+    for (kind, name), group in groups.items():
+        seconds = sorted(r["seconds"] for r in group)
+        hits = [r["cache_hit"] for r in group if r.get("cache_hit") is not None]
+        rows.append(
+            {
+                "kind": kind,
+                "name": name,
+                "count": len(group),
+                "p50_ms": percentile(seconds, 50) * 1000,
+                "p95_ms": percentile(seconds, 95) * 1000,
+                "max_ms": seconds[-1] * 1000,
+                "rows": _max_field(group, "rows"),
+                "mib": None if (b := _max_field(group, "bytes")) is None else b / 2**20,
+                "hit_rate": sum(hits) / len(hits) if hits else None,
+            }
+        )
+    rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+    return rows
+
+
+def export_jsonl(recs: list[dict]) -> str:
+    return "".join(json.dumps(rec) + "\n" for rec in recs)
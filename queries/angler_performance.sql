@@ -7,9 +7,9 @@ SELECT
     r.fish,
     r.big_bass,
     prize
-FROM tournaments t
-JOIN results r ON r.tournament_id = t.id
-WHERE
-    LOWER(r.angler1) LIKE ?
-    OR LOWER(r.angler2) LIKE ?
+FROM anglers a
+JOIN result_anglers ra ON ra.angler_id = a.id
+JOIN results r ON r.rowid = ra.result_id
+JOIN tournaments t ON r.tournament_id = t.id
+WHERE a.name = ?
 ORDER BY r.place ASC, t.date DESC
@@ -0,0 +1,11 @@
+SELECT
+    a.name AS angler,
+    r.rating,
+    r.peak,
+    r.events,
+    r.last_date
+FROM angler_ratings r
+JOIN anglers a ON a.id = r.angler_id
+WHERE r.events >= ?
+ORDER BY r.rating DESC
+LIMIT ?
@@ -1,9 +1,8 @@
 SELECT
-    t.lake,
-    r.place,
-    COUNT(*) AS tournament_count,
-    ROUND(AVG(r.weight), 2) AS avg_winning_weight
-FROM tournaments t
-JOIN results r ON t.id = r.tournament_id
-WHERE r.place in (1, 2, 3) AND t.lake IS NOT NULL
-GROUP BY t.lake
\ No newline at end of file
+    lake,
+    MIN(place) AS place,
+    SUM(result_count) AS tournament_count,
+    ROUND(SUM(weight_total) / SUM(weight_count), 2) AS avg_winning_weight
+FROM summary_lake_year_place
+WHERE lake != ''
+GROUP BY lake
@@ -0,0 +1,9 @@
+SELECT
+    rowid AS id,
+    highlight(angler_search, 0, char(2), char(3)) AS angler,
+    snippet(angler_search, 1, char(2), char(3), '…', 12) AS hometowns,
+    results
+FROM angler_search
+WHERE angler_search MATCH ?
+ORDER BY bm25(angler_search, 10.0, 2.0), results DESC
+LIMIT ?
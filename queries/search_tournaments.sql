@@ -0,0 +1,12 @@
+SELECT
+    rowid AS id,
+    date,
+    highlight(tournament_search, 0, char(2), char(3)) AS tournament,
+    highlight(tournament_search, 1, char(2), char(3)) AS lake,
+    highlight(tournament_search, 2, char(2), char(3)) AS trail,
+    highlight(tournament_search, 3, char(2), char(3)) AS region,
+    snippet(tournament_search, 5, char(2), char(3), '…', 8) AS prizes
+FROM tournament_search
+WHERE tournament_search MATCH ?
+ORDER BY bm25(tournament_search, 10.0, 5.0, 2.0, 2.0, 2.0, 1.0)
+LIMIT ?
@@ -0,0 +1,13 @@
+SELECT
+    a1.name AS angler1,
+    CASE WHEN r.angler2_id != r.angler1_id THEN a2.name END AS angler2,
+    r.rating,
+    r.peak,
+    r.events,
+    r.last_date
+FROM team_ratings r
+JOIN anglers a1 ON a1.id = r.angler1_id
+JOIN anglers a2 ON a2.id = r.angler2_id
+WHERE r.events >= ?
+ORDER BY r.rating DESC
+LIMIT ?
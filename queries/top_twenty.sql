@@ -1,12 +1,18 @@
-            SELECT
-                place,
-                angler1,
-                angler2,
-                fish,
-                big_bass,
-                weight,
-                prize
-            FROM results
-            WHERE tournament_id = ?
-            ORDER BY place ASC
-            LIMIT 20
\ No newline at end of file
+SELECT
+    tournament_id,
+    place,
+    angler1,
+    angler2,
+    fish,
+    big_bass,
+    weight,
+    prize
+FROM (
+    SELECT
+        *,
+        ROW_NUMBER() OVER (PARTITION BY tournament_id ORDER BY place ASC) AS rn
+    FROM results
+    WHERE tournament_id IN (SELECT value FROM json_each(?))
+)
+WHERE rn <= 20
+ORDER BY tournament_id, place ASC
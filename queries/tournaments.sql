@@ -0,0 +1 @@
+SELECT id, tournament, date FROM tournaments ORDER BY date DESC
@@ -0,0 +1,258 @@
+import json
+from collections.abc import Iterable
+from itertools import groupby
+from sqlite3 import Connection
+
+import numpy as np
+
+# Multiplayer Elo: a tournament counts as a game between every pair of teams,
+# won by the better place. A team plays at the mean rating of its anglers and
+# each angler takes the team's whole change; teams are also rated as a pair.
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0
+
+RATINGS_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS angler_ratings (
+        angler_id INTEGER PRIMARY KEY REFERENCES anglers (id),
+        rating REAL NOT NULL,
+        peak REAL NOT NULL,
+        events INTEGER NOT NULL,
+        last_date TEXT NOT NULL
+    )
+    """,
+    # A solo entry is the team (id, id).
+    """
+    CREATE TABLE IF NOT EXISTS team_ratings (
+        angler1_id INTEGER NOT NULL REFERENCES anglers (id),
+        angler2_id INTEGER NOT NULL REFERENCES anglers (id),
+        rating REAL NOT NULL,
+        peak REAL NOT NULL,
+        events INTEGER NOT NULL,
+        last_date TEXT NOT NULL,
+        PRIMARY KEY (angler1_id, angler2_id)
+    ) WITHOUT ROWID
+    """,
+    # The leaderboards read these from the top and stop at their LIMIT.
+    """
+    CREATE INDEX IF NOT EXISTS idx_angler_ratings_rating
+    ON angler_ratings (rating DESC)
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_team_ratings_rating ON team_ratings (rating DESC)",
+    # The last tournament rated, by (date, id): everything after it is rated
+    # incrementally, anything before it needs a replay.
+    """
+    CREATE TABLE IF NOT EXISTS rating_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_date TEXT NOT NULL,
+        last_tournament_id INTEGER NOT NULL,
+        tournaments INTEGER NOT NULL
+    )
+    """,
+)
+
+# Every finish with its anglers, tournament by tournament in date order.
+_ENTRIES = """
+SELECT t.id, t.date, r.place, a1.id, a2.id
+FROM tournaments t
+JOIN results r ON r.tournament_id = t.id
+LEFT JOIN anglers a1 ON a1.name = r.angler1
+LEFT JOIN anglers a2 ON a2.name = r.angler2
+WHERE r.place IS NOT NULL AND (a1.id IS NOT NULL OR a2.id IS NOT NULL) {where}
+ORDER BY t.date, t.id, r.place
+"""
+
+
+def create_ratings(conn: Connection) -> None:
+    for ddl in RATINGS_DDL:
+        conn.execute(ddl)
+
+
+def elo_changes(ratings: np.ndarray, places: np.ndarray) -> np.ndarray:
+    # Rating change of each entry in one tournament. Each pair is a game
+    # scored 1, 0.5 or 0 by place; the sum over opponents is scaled by n - 1
+    # so a tournament moves a rating as much as a single game would.
+    n = len(ratings)
+    if n < 2:
+        return np.zeros(n)
+    expected = 1 / (1 + 10 ** ((ratings[None, :] - ratings[:, None]) / SCALE))
+    actual = (places[:, None] < places[None, :]) + 0.5 * (
+        places[:, None] == places[None, :]
+    )
+    return K_FACTOR * (actual - expected).sum(axis=1) / (n - 1)
+
+
+def _team(entry: tuple) -> tuple[int, ...]:
+    # The distinct angler ids of an entry, sorted.
+    return tuple(sorted({a for a in entry[1:] if a is not None}))
+
+
+class RatingState:
+    # angler id -> [rating, peak, events, last_date], and the same per team.
+    def __init__(self, anglers=None, teams=None):
+        self.anglers: dict[int, list] = anglers or {}
+        self.teams: dict[tuple[int, int], list] = teams or {}
+
+    def _get(self, table: dict, key) -> list:
+        row = table.get(key)
+        if row is None:
+            row = table[key] = [INITIAL_RATING, INITIAL_RATING, 0, None]
+        return row
+
+    def rate(self, date: str, entries: list[tuple]) -> None:
+        # entries: (place, angler1 id, angler2 id) for one tournament.
+        places = np.array([e[0] for e in entries], dtype=float)
+        members = [_team(e) for e in entries]
+        angler_rows = [[self._get(self.anglers, a) for a in m] for m in members]
+        team_rows = [self._get(self.teams, (m[0], m[-1])) for m in members]
+
+        strength = np.array(
+            [sum(r[0] for r in rows) / len(rows) for rows in angler_rows]
+        )
+        for rows, change in zip(angler_rows, elo_changes(strength, places)):
+            for row in rows:
+                _apply(row, change, date)
+        team_strength = np.array([row[0] for row in team_rows])
+        for row, change in zip(team_rows, elo_changes(team_strength, places)):
+            _apply(row, change, date)
+
+
+def _apply(row: list, change: float, date: str) -> None:
+    row[0] += change
+    row[1] = max(row[1], row[0])
+    row[2] += 1
+    row[3] = date
+
+
+def _tournaments(conn: Connection, where: str = "", params=()):
+    # Yields (id, date, [(place, angler1 id, angler2 id), ...]).
+    rows = conn.execute(_ENTRIES.format(where=where), params)
+    for (t_id, date), group in groupby(rows, key=lambda r: (r[0], r[1])):
+        yield t_id, date, [r[2:] for r in group]
+
+
+def _watermark(conn: Connection) -> tuple | None:
+    return conn.execute(
+        "SELECT last_date, last_tournament_id, tournaments FROM rating_state"
+    ).fetchone()
+
+
+def _load_state(conn: Connection, anglers: set, teams: set) -> RatingState:
+    # The stored ratings of just these anglers and teams.
+    ids = json.dumps(sorted(anglers))
+    return RatingState(
+        {
+            a_id: [rating, peak, events, last]
+            for a_id, rating, peak, events, last in conn.execute(
+                "SELECT angler_id, rating, peak, events, last_date FROM angler_ratings"
+                " WHERE angler_id IN (SELECT value FROM json_each(?))",
+                (ids,),
+            )
+        },
+        {
+            (a1, a2): [rating, peak, events, last]
+            for a1, a2, rating, peak, events, last in conn.execute(
+                "SELECT angler1_id, angler2_id, rating, peak, events, last_date"
+                " FROM team_ratings"
+                " WHERE angler1_id IN (SELECT value FROM json_each(?))",
+                (ids,),
+            )
+            if (a1, a2) in teams
+        },
+    )
+
+
+def _save_state(conn: Connection, state: RatingState, anglers, teams) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO angler_ratings"
+        " (angler_id, rating, peak, events, last_date) VALUES (?, ?, ?, ?, ?)",
+        ((a_id, *state.anglers[a_id]) for a_id in anglers),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO team_ratings"
+        " (angler1_id, angler2_id, rating, peak, events, last_date)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        ((*key, *state.teams[key]) for key in teams),
+    )
+
+
+def _save_watermark(conn: Connection, last: tuple, count: int) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO rating_state"
+        " (id, last_date, last_tournament_id, tournaments) VALUES (1, ?, ?, ?)",
+        (*last, count),
+    )
+
+
+def delete_ratings(conn: Connection, angler_ids: Iterable[int]) -> None:
+    # For anglers about to be deleted; their tournaments get replayed.
+    ids = json.dumps(list(angler_ids))
+    create_ratings(conn)
+    conn.execute(
+        "DELETE FROM angler_ratings WHERE angler_id IN (SELECT value FROM json_each(?))",
+        (ids,),
+    )
+    conn.execute(
+        "DELETE FROM team_ratings WHERE angler1_id IN (SELECT value FROM json_each(?))"
+        " OR angler2_id IN (SELECT value FROM json_each(?))",
+        (ids, ids),
+    )
+
+
+def compute_ratings(conn: Connection) -> tuple[RatingState, tuple | None, int]:
+    # Rates the whole history from scratch without writing anything; returns
+    # the state, the last (date, id) rated and the number of tournaments.
+    state = RatingState()
+    last, count = None, 0
+    for t_id, date, entries in _tournaments(conn):
+        state.rate(date, entries)
+        last, count = (date, t_id), count + 1
+    return state, last, count
+
+
+def replay_ratings(conn: Connection) -> int:
+    # Full replay: recomputes every rating in date order and rewrites the
+    # tables. Returns the number of tournaments rated.
+    create_ratings(conn)
+    state, last, count = compute_ratings(conn)
+    conn.execute("DELETE FROM angler_ratings")
+    conn.execute("DELETE FROM team_ratings")
+    conn.execute("DELETE FROM rating_state")
+    _save_state(conn, state, state.anglers, state.teams)
+    if last:
+        _save_watermark(conn, last, count)
+    return count
+
+
+def update_ratings(conn: Connection, tournament_ids: Iterable[int] = ()) -> int:
+    # Rates the tournaments dated after the last one rated, starting from the
+    # stored ratings. If any of tournament_ids (just loaded or reloaded) is
+    # not after it, the order changed and everything is replayed instead.
+    # Returns the number of tournaments rated.
+    create_ratings(conn)
+    mark = _watermark(conn)
+    if mark is None:
+        return replay_ratings(conn)
+    last_date, last_id, count = mark
+    (earlier,) = conn.execute(
+        "SELECT COUNT(*) FROM tournaments WHERE id IN (SELECT value FROM json_each(?))"
+        " AND (date, id) <= (?, ?)",
+        (json.dumps(list(tournament_ids)), last_date, last_id),
+    ).fetchone()
+    if earlier:
+        return replay_ratings(conn)
+
+    new = list(_tournaments(conn, "AND (t.date, t.id) > (?, ?)", (last_date, last_id)))
+    if not new:
+        return 0
+    members = {_team(e) for _, _, entries in new for e in entries}
+    anglers = {a for m in members for a in m}
+    teams = {(m[0], m[-1]) for m in members}
+    state = _load_state(conn, anglers, teams)
+    for _, date, entries in new:
+        state.rate(date, entries)
+    _save_state(conn, state, anglers, teams)
+    t_id, date, _ = new[-1]
+    _save_watermark(conn, (date, t_id), count + len(new))
+    return len(new)
@@ -0,0 +1,137 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from sqlite3 import Connection
+from typing import TYPE_CHECKING
+
+import perf
+from cache import frame_bytes
+from db import BACKEND, QUERY_CACHE, db_version, read_sql
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+QUERY_DIR = Path(__file__).resolve().parent / "queries"
+TIMING_WINDOW = 256
+MAX_PARAMS = 64
+BINDING_ERROR = "Incorrect number of bindings supplied"
+
+
+class QueryError(RuntimeError):
+    pass
+
+
+class Query:
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self._n_params: int | None = None
+        self.timings: deque[float] = deque(maxlen=TIMING_WINDOW)
+
+    def __call__(self, c: Connection, params=()) -> "pd.DataFrame":
+        start = time.perf_counter()
+        df = None
+        try:
+            snapshot = _snapshot()
+            # The snapshot holds results only; derived tables such as the
+            # ratings are still read from the database.
+            if snapshot and snapshot.supports(self.name):
+                df = QUERY_CACHE.get_or_load(
+                    (self.name, tuple(params), snapshot.mtime_ns),
+                    lambda: snapshot.query(self.name, params),
+                )
+            else:
+                df = read_sql(c, self.sql, params)
+            return df
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings.append(seconds)
+            if perf.ENABLED:
+                hit = QUERY_CACHE.last_hit()
+                perf.record(
+                    "query",
+                    self.name,
+                    seconds,
+                    rows=None if df is None else len(df),
+                    # Measuring a frame costs more than a cache hit, so only
+                    # frames just loaded are measured.
+                    bytes=None if df is None or hit else frame_bytes(df),
+                    cache_hit=hit,
+                )
+
+    def n_params(self, c: Connection) -> int:
+        # Taken from the prepared statement, which only runs with exactly
+        # the right number of parameters, so a "?" in a string literal or a
+        # comment isn't counted.
+        if self._n_params is None:
+            if not self.sql:
+                raise QueryError("empty query")
+            for n in range(MAX_PARAMS + 1):
+                try:
+                    c.execute(f"EXPLAIN {self.sql}", [None] * n)
+                except sqlite3.ProgrammingError as e:
+                    # Anything else, such as two statements in one file, is
+                    # the query's own error.
+                    if not str(e).startswith(BINDING_ERROR):
+                        raise
+                    continue
+                self._n_params = n
+                break
+            else:
+                raise QueryError(f"takes more than {MAX_PARAMS} parameters")
+        return self._n_params
+
+    def explain(self, c: Connection) -> list:
+        return c.execute(f"EXPLAIN {self.sql}", [None] * self.n_params(c)).fetchall()
+
+
+def _snapshot():
+    # pyarrow is only needed, and only imported, for the arrow backend.
+    if BACKEND != "arrow":
+        return None
+    from snapshot import get_snapshot
+
+    return get_snapshot()
+
+
+def data_version(c: Connection) -> tuple:
+    # Changes whenever the data behind the queries may have.
+    if BACKEND == "arrow":
+        return BACKEND, _snapshot().mtime_ns
+    return BACKEND, db_version(c)
+
+
+_queries: dict[str, Query] | None = None
+_lock = threading.Lock()
+
+
+def queries() -> dict[str, Query]:
+    global _queries
+    if _queries is None:
+        with _lock:
+            if _queries is None:
+                _queries = {
+                    p.stem: Query(p.stem, p.read_text(encoding="utf-8").strip())
+                    for p in sorted(QUERY_DIR.glob("*.sql"))
+                }
+    return _queries
+
+
+def get_query(name: str) -> Query:
+    try:
+        return queries()[name]
+    except KeyError:
+        raise QueryError(f"Unknown query: {name}") from None
+
+
+def validate(c: Connection) -> None:
+    errors = []
+    for q in queries().values():
+        try:
+            q.explain(c)
+        except (sqlite3.Error, QueryError) as e:
+            errors.append(f"{q.name}: {e}")
+    if errors:
+        raise QueryError("Invalid queries:\n" + "\n".join(errors))
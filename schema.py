@@ -0,0 +1,155 @@
+import re
+from sqlite3 import Connection
+
+from anglers import ANGLER_DDL, rebuild_anglers
+from lakes import OVERRIDE_DDL, seed_overrides
+from search import SEARCH_DDL, rebuild_search
+from summary import SUMMARY_DDL, rebuild_summaries
+
+
+class SchemaError(RuntimeError):
+    pass
+
+
+BASE_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS tournaments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        lake TEXT,
+        region TEXT,
+        tournament TEXT,
+        tournament_trail TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tournament_id INTEGER REFERENCES tournaments(id),
+        place INTEGER,
+        skeeter_boat BOOLEAN,
+        angler1 TEXT,
+        angler1_hometown TEXT,
+        angler2 TEXT,
+        angler2_hometown TEXT,
+        fish INTEGER,
+        big_bass REAL,
+        weight REAL,
+        prize TEXT
+    )
+    """,
+)
+
+INDEX_DDL = (
+    # The natural key. Also covers tournaments.sql (id is the rowid), which
+    # then reads the index in date order instead of sorting the table.
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_tournaments_date_tournament
+    ON tournaments (date, tournament)
+    """,
+    # Lake backfills look up tournaments without a lake.
+    "CREATE INDEX IF NOT EXISTS idx_tournaments_lake ON tournaments (lake)",
+    # top_twenty.sql, angler linking and reloads: a tournament's results in
+    # place order, so the window needs no sort. Twenty rowid lookups per
+    # tournament are cheaper than an index copying eight result columns.
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_tournament_place
+    ON results (tournament_id, place)
+    """,
+    # Covers the summary aggregate behind avg_wt_yr.sql, avg_win_wt_lake.sql
+    # and wt_lake_year.sql, which only reads the top places' weights.
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_place_weight
+    ON results (place, tournament_id, weight)
+    """,
+)
+
+
+def _add_ratings(conn: Connection) -> None:
+    # ratings needs numpy, so it is imported only when this step runs.
+    from ratings import create_ratings, replay_ratings
+
+    create_ratings(conn)
+    replay_ratings(conn)
+
+
+# Applied in order; the database's user_version is the number applied. A step
+# is SQL or a callable taking the connection. Never edit a released step, add
+# a new one.
+MIGRATIONS = (
+    BASE_DDL,
+    ("DROP INDEX IF EXISTS idx_results_tournament", *INDEX_DDL),
+    (SUMMARY_DDL, *ANGLER_DDL, rebuild_summaries, rebuild_anglers),
+    (OVERRIDE_DDL, seed_overrides),
+    (_add_ratings,),
+    (*SEARCH_DDL, rebuild_search),
+    # Nothing looks anglers up by norm since the name index (name_index.py).
+    ("DROP INDEX IF EXISTS idx_anglers_norm",),
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Tables small enough that a full scan is the plan we want.
+SMALL_TABLES = {"summary_lake_year_place"}
+
+
+def schema_version(conn: Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: Connection) -> int:
+    # Each migration is its own transaction, so a failed step leaves the
+    # database at the previous version. Returns the number applied.
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise SchemaError(
+            f"Database schema version {version} is newer than this code "
+            f"({SCHEMA_VERSION})"
+        )
+    for v, steps in enumerate(MIGRATIONS[version:], start=version + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {v}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    applied = SCHEMA_VERSION - version
+    if applied:
+        analyze(conn)
+    return applied
+
+
+def check_schema(conn: Connection) -> None:
+    version = schema_version(conn)
+    if version != SCHEMA_VERSION:
+        raise SchemaError(
+            f"Database schema is at version {version}, expected {SCHEMA_VERSION}. "
+            "Run scripts/migrate.py."
+        )
+
+
+def analyze(conn: Connection) -> None:
+    # Refresh the planner statistics after bulk changes.
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def query_plan(conn: Connection, sql: str, n_params: int = 0) -> list[str]:
+    return [
+        row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * n_params)
+    ]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    # Plain "SCAN <table>" lines, i.e. not through an index, a virtual table
+    # or a subquery.
+    return [
+        line
+        for line in plan
+        if (m := re.fullmatch(r"SCAN (\w+)", line)) and m[1] not in SMALL_TABLES
+    ]
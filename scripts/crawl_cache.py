@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "cache"
+
+
+class CrawlState:
+    # Manifest of every fetched URL (validators, content hash, cached body and
+    # the JSON file it produced) plus the raw bodies, so reruns can send
+    # conditional GETs and skip tournaments that are already on disk.
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.body_dir = self.cache_dir / "http"
+        self.manifest_file = self.cache_dir / "manifest.json"
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        if self.manifest_file.exists():
+            with open(self.manifest_file, mode="r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def body_path(self, url: str) -> Path:
+        return self.body_dir / f"{hashlib.sha1(url.encode()).hexdigest()}.html"
+
+    def read_body(self, url: str) -> bytes | None:
+        try:
+            return self.body_path(url).read_bytes()
+        except OSError:
+            return None
+
+    def validators(self, url: str) -> dict:
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, body: bytes, etag=None, last_modified=None) -> None:
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        path = self.body_path(url)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry.update(
+                etag=etag,
+                last_modified=last_modified,
+                sha256=hashlib.sha256(body).hexdigest(),
+                body=str(path.relative_to(self.cache_dir)),
+                fetched_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            )
+
+    def record_output(self, url: str, output) -> None:
+        output = os.path.relpath(output, self.cache_dir.parent)
+        with self._lock:
+            self.entries.setdefault(url, {})["output"] = output
+
+    def has_output(self, url: str) -> bool:
+        output = self.entries.get(url, {}).get("output")
+        return bool(output) and (self.cache_dir.parent / output).exists()
+
+    def save(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_file.with_suffix(".tmp")
+        with self._lock, open(tmp, mode="w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4, sort_keys=True)
+        os.replace(tmp, self.manifest_file)
+
+
+class CachingFetcher:
+    # Same get/map interface as scrape_basschamps.Fetcher, but revalidates
+    # against the crawl state and serves 304s from the cached body.
+    def __init__(self, fetcher, state: CrawlState):
+        self.fetcher = fetcher
+        self.state = state
+        self.not_modified = 0
+
+    def get(self, url: str) -> bytes:
+        cached = self.state.read_body(url)
+        headers = self.state.validators(url) if cached is not None else {}
+        response = self.fetcher.fetch(url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self.not_modified += 1
+            logger.debug(f"Not modified: {url}")
+            return cached
+        self.state.store(
+            url,
+            response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return response.content
+
+    def map(self, func, items):
+        return self.fetcher.map(func, items)
@@ -0,0 +1,38 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_FILE  # noqa: E402
+from registry import queries  # noqa: E402
+from schema import SchemaError, check_schema, full_scans, query_plan  # noqa: E402
+
+
+if __name__ == "__main__":
+    # Prints the plan of every registered query and exits non-zero if any of
+    # them scans a large table without an index.
+    parser = argparse.ArgumentParser(
+        description="Print every registered query's plan and flag full scans."
+    )
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    args = parser.parse_args()
+    conn = sqlite3.connect(f"{args.db.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        check_schema(conn)
+    except SchemaError as e:
+        sys.exit(f"❌ {e}")
+    flagged = []
+    for q in queries().values():
+        plan = query_plan(conn, q.sql, q.n_params(conn))
+        print(f"-- {q.name}")
+        for line in plan:
+            print(f"   {line}")
+        flagged += [f"{q.name}: {line}" for line in full_scans(plan)]
+    conn.close()
+    if flagged:
+        print("\n❌ Full table scans:\n" + "\n".join(flagged))
+        sys.exit(1)
+    print("\n✅ No full table scans")
@@ -0,0 +1,23 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_FILE  # noqa: E402
+from snapshot import export_snapshot, snapshot_path  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    parser.add_argument(
+        "--snapshot", type=Path, help="defaults to the database's path with .arrow"
+    )
+    args = parser.parse_args()
+    snapshot = args.snapshot or snapshot_path(args.db)
+    with sqlite3.connect(args.db) as conn:
+        rows = export_snapshot(conn, snapshot)
+    print(f"✅ Exported {rows} results to: {snapshot}")
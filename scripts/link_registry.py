@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+LINKS_FILE = Path(__file__).resolve().parent.parent / "links" / "basschamps_links.json"
+
+
+def canonical_url(url: str) -> str:
+    # The same tournament is linked with its query params in different
+    # orders, so compare links on a sorted query (and no fragment).
+    parts = urlsplit(url)
+    query = "&".join(sorted(p for p in parts.query.split("&") if p))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+
+
+class LinkRegistry:
+    # Ordered set of tournament links keyed on their canonical form, keeping
+    # the first spelling seen (the crawl manifest is keyed on it). The JSON
+    # snapshot is read on first use; links added since are appended to a
+    # journal next to it so a crash mid-crawl loses nothing, and compact()
+    # folds the journal back into the snapshot.
+    def __init__(self, path=LINKS_FILE):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self._links: dict[str, str] | None = None
+        self._journal = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, str]:
+        if self._links is not None:
+            return self._links
+        links = {}
+        if self.path.exists() and self.path.stat().st_size > 0:
+            logger.info(f"Loading links from {self.path}")
+            with open(self.path, mode="r", encoding="utf-8") as f:
+                for url in json.load(f):
+                    links.setdefault(canonical_url(url), url)
+        if self.journal_path.exists():
+            with open(self.journal_path, mode="r", encoding="utf-8") as f:
+                # The last line may be torn if a crawl died mid-write.
+                for url in f.read().split("\n")[:-1]:
+                    if url:
+                        links.setdefault(canonical_url(url), url)
+        self._links = links
+        return links
+
+    def __contains__(self, url: str) -> bool:
+        return canonical_url(url) in self._load()
+
+    def __iter__(self):
+        return iter(list(self._load().values()))
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def add(self, url: str) -> bool:
+        key = canonical_url(url)
+        with self._lock:
+            links = self._load()
+            if key in links:
+                return False
+            links[key] = url
+            if self._journal is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._drop_torn_line()
+                self._journal = open(self.journal_path, mode="a", encoding="utf-8")
+            self._journal.write(f"{url}\n")
+            self._journal.flush()
+        return True
+
+    def _drop_torn_line(self) -> None:
+        # Cut a partial last line off before appending after it.
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, mode="rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def compact(self) -> None:
+        with self._lock:
+            if self._journal is None and not self.journal_path.exists():
+                return
+            links = self._load()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, mode="w", encoding="utf-8") as f:
+                json.dump(list(links.values()), f, indent=4)
+            os.replace(tmp, self.path)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self.journal_path.unlink(missing_ok=True)
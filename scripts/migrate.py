@@ -0,0 +1,26 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_FILE  # noqa: E402
+from schema import SCHEMA_VERSION, migrate  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bring a database's schema up to date."
+    )
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    args = parser.parse_args()
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    try:
+        applied = migrate(conn)
+    finally:
+        conn.close()
+    print(
+        f"✅ Applied {applied} migration(s), {args.db} is at version {SCHEMA_VERSION}"
+    )
@@ -0,0 +1,96 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from db import DB_FILE  # noqa: E402
+from ratings import compute_ratings, replay_ratings, update_ratings  # noqa: E402
+from schema import migrate  # noqa: E402
+
+TOLERANCE = 1e-6
+
+
+def _compare(kind: str, replayed: dict, stored: dict) -> list[str]:
+    # Both map a key to (rating, events).
+    problems = [
+        f"{kind} {key} has no stored rating" for key in replayed.keys() - stored.keys()
+    ]
+    problems += [
+        f"{kind} {key} is rated but has no results"
+        for key in stored.keys() - replayed.keys()
+    ]
+    for key, (rating, events) in replayed.items():
+        if key in stored:
+            got_rating, got_events = stored[key]
+            if abs(got_rating - rating) > TOLERANCE or got_events != events:
+                problems.append(
+                    f"{kind} {key}: stored {got_rating:.4f} over {got_events} events,"
+                    f" replay gives {rating:.4f} over {events}"
+                )
+    return problems
+
+
+def audit(conn: sqlite3.Connection) -> list[str]:
+    # Replays the whole history in memory and compares it with the stored
+    # angler and team ratings, which the loader updated incrementally.
+    state, _, _ = compute_ratings(conn)
+    anglers = {
+        a_id: (rating, events)
+        for a_id, rating, events in conn.execute(
+            "SELECT angler_id, rating, events FROM angler_ratings"
+        )
+    }
+    teams = {
+        (a1, a2): (rating, events)
+        for a1, a2, rating, events in conn.execute(
+            "SELECT angler1_id, angler2_id, rating, events FROM team_ratings"
+        )
+    }
+    return _compare(
+        "angler",
+        {
+            a_id: (rating, events)
+            for a_id, (rating, _, events, _) in state.anglers.items()
+        },
+        anglers,
+    ) + _compare(
+        "team",
+        {key: (rating, events) for key, (rating, _, events, _) in state.teams.items()},
+        teams,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update or audit angler ratings.")
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--replay", action="store_true", help="recompute every rating from scratch"
+    )
+    mode.add_argument(
+        "--audit",
+        action="store_true",
+        help="compare the stored ratings with a full replay, without writing",
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    try:
+        migrate(conn)
+        if args.audit:
+            problems = audit(conn)
+            for problem in problems[:20]:
+                print("❌", problem)
+            if problems:
+                sys.exit(f"{len(problems)} rating(s) differ from a full replay")
+            print("✅ Stored ratings match a full replay")
+        else:
+            conn.execute("BEGIN IMMEDIATE")
+            rated = replay_ratings(conn) if args.replay else update_ratings(conn)
+            conn.execute("COMMIT")
+            print(f"✅ Rated {rated} tournament(s) in:", args.db)
+    finally:
+        conn.close()
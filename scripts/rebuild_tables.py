@@ -0,0 +1,30 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from anglers import rebuild_anglers  # noqa: E402
+from db import DB_FILE  # noqa: E402
+from ratings import replay_ratings  # noqa: E402
+from schema import analyze, migrate  # noqa: E402
+from search import rebuild_search  # noqa: E402
+from summary import rebuild_summaries  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild every derived table from the tournament results."
+    )
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    args = parser.parse_args()
+    with sqlite3.connect(args.db) as conn:
+        migrate(conn)
+        rebuild_summaries(conn)
+        rebuild_anglers(conn)
+        replay_ratings(conn)  # angler ids change with the rebuild
+        rebuild_search(conn)
+        analyze(conn)
+    print("✅ Rebuilt summary, angler, rating and search tables in:", args.db)
@@ -1,12 +1,29 @@
+import argparse
 import json
 import logging
 import os
+import queue
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from crawl_cache import CACHE_DIR, CachingFetcher, CrawlState
+from link_registry import LINKS_FILE, LinkRegistry
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -17,138 +34,395 @@ logger = logging.getLogger(__name__)
 
 
 MIN_YEAR = 2006
-MAX_YEAR = 2026
-LINKS_FILE = Path(__file__).resolve().parent.parent / "links" / "basschamps_links.json"
+BASE_URL = "https://basschamps.com"
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+MAX_WORKERS = 8
+RATE_LIMIT = 4.0  # requests per second per host
+REQUEST_TIMEOUT = 10
+MAX_ATTEMPTS = 4
+PARSE_WORKERS = os.cpu_count() or 1
+QUEUE_SIZE = 64  # pages buffered between pipeline stages
 
 TOURNAMENT_TYPE = "type=team"
-ALL_LINKS = []
-if os.path.exists(LINKS_FILE) and os.path.getsize(LINKS_FILE) > 0:
-    with open(LINKS_FILE, mode="r", encoding="utf-8") as f:
-        logger.info(f"Loading links from {LINKS_FILE}")
-        ALL_LINKS = json.load(f)
 
+try:
+    import lxml  # noqa: F401
+
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        # Reserve the next free slot for the host, then sleep outside the lock.
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _retryable(e: BaseException) -> bool:
+    if isinstance(e, requests.HTTPError):
+        status = e.response.status_code if e.response is not None else 0
+        return status == 429 or status >= 500
+    return isinstance(e, requests.RequestException)
+
+
+class Fetcher:
+    def __init__(
+        self,
+        max_workers=MAX_WORKERS,
+        rate=RATE_LIMIT,
+        timeout=REQUEST_TIMEOUT,
+    ):
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate)
+        self._local = threading.local()
+        self._sessions: list[requests.Session] = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+            self._sessions.append(self._local.session)
+        return self._local.session
+
+    @retry(
+        retry=retry_if_exception(_retryable),
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        wait=wait_exponential(multiplier=0.5, max=8),
+        reraise=True,
+    )
+    def fetch(self, url: str, headers=None) -> requests.Response:
+        self.limiter.wait(urlsplit(url).netloc)
+        response = self._session().get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def get(self, url: str) -> bytes:
+        return self.fetch(url).content
+
+    def map(self, func, items):
+        return self._pool.map(func, items)
+
+    def close(self) -> None:
+        self._pool.shutdown()
+        for s in self._sessions:
+            s.close()
+
+    def __enter__(self):
+        return self
 
-def generate_annual_links(min_year, max_year):
+    def __exit__(self, *exc):
+        self.close()
+
+
+def generate_annual_links(min_year, max_year, base_url=BASE_URL):
     # Example annual link:
     # https://basschamps.com/resultsIntro.cfm?type=team&yearSelected=2006
-    base_url = "https://basschamps.com/resultsIntro.cfm?"
     return [
-        f"{base_url}{TOURNAMENT_TYPE}&yearSelected={y}"
+        f"{base_url}/resultsIntro.cfm?{TOURNAMENT_TYPE}&yearSelected={y}"
         for y in range(min_year, max_year)
     ]
 
 
-def get_tournament_links(s, urls):
-    global ALL_LINKS
+def get_tournament_links(fetcher, urls, links, base_url=BASE_URL):
+    def _fetch(url):
+        try:
+            return url, fetcher.get(url)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return url, None
 
-    base_url = "https://basschamps.com"
-    for url in urls:
-        response = s.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, "html.parser")
+    pattern = re.compile(
+        r"^results\.cfm\?tournament_id=\d+&type=team&yearSelected=\d+$"
+    )
+    for url, content in fetcher.map(_fetch, urls):
+        if content is None:
+            continue
+        soup = BeautifulSoup(_decode(content), PARSER, parse_only=SoupStrainer("a"))
         logger.debug(f"\n\nGetting tournaments for: {url}")
-        pattern = re.compile(
-            r"^results\.cfm\?tournament_id=\d+&type=team&yearSelected=\d+$"
-        )
         for link in soup.find_all("a", href=pattern):
             href = link["href"].replace("&amp;", "&")
             l = f"{base_url}/{href}&action=displayThisMany&page=recalculate&sortField=place&junior=no"
-            if l not in ALL_LINKS:
-                ALL_LINKS.append(l)
-            else:
+            if not links.add(l):
                 logger.info(f"Link exists, skipping ... {l}")
-    with open(LINKS_FILE, mode="w", encoding="utf-8") as f:
-        json.dump(ALL_LINKS, f, indent=4)
-
-
-def get_tournament_results(s, url):
-    def _get_text_clean(c):
-        return c.get_text(strip=True).replace("\xa0", "")
-
-    def _parse_angler_cell(c):
-        bs = BeautifulSoup(str(c), "html.parser")
-        full_text = bs.get_text(separator="\n").strip()
-        lines = [line.strip() for line in full_text.split("\n") if line.strip()]
-        name = lines[0] if lines else ""
-        strong_tags = bs.find_all("strong")
-        if len(strong_tags) >= 2:
-            city = strong_tags[0].get_text(strip=True)
-            state = strong_tags[1].get_text(strip=True)
-            hometown = f"{city}, {state}"
-        else:
-            hometown = ""
-        return name.title(), hometown.title()
-
-    def _parse_results_table():
-        results = []
-        for row in soup.find_all("tr"):
-            cells = row.find_all("td")
-            if not cells or len(cells) < 9:
-                continue  # skip malformed or irrelevant rows
-            try:
-                place = int(_get_text_clean(cells[0]))
-            except ValueError:
-                continue  # skip header rows or non-numeric places
-            boat_cell = cells[1]
-            img_tag = boat_cell.find("img")
-            angler1, hometown1 = _parse_angler_cell(cells[3])
-            angler2, hometown2 = _parse_angler_cell(cells[4])
-            results.append(
-                {
-                    "place": place,
-                    "skeeter_boat": True
-                    if img_tag and "skeeter" in img_tag.get("src", "").lower()
-                    else False,
-                    "angler1": angler1,
-                    "angler1_hometown": hometown1,
-                    "angler2": angler2,
-                    "angler2_hometown": hometown2,
-                    "fish": int(_get_text_clean(cells[5])),
-                    "big bass": float(_get_text_clean(cells[6])),
-                    "Wt.": float(_get_text_clean(cells[7])),
-                    "prize": _get_text_clean(cells[8]) if cells[8] else None,
-                }
-            )
-        return results
 
-    #
-    # Get Tournament Results
-    #
+
+def _decode(content):
+    # BeautifulSoup runs charset detection over the whole page when handed
+    # bytes. Pages with no BOM or declared charset that are valid UTF-8 are
+    # what that detection settles on anyway, so decode those up front.
+    if not isinstance(content, bytes):
+        return content
+    data, bom = EncodingDetector.strip_byte_order_mark(content)
+    if bom or EncodingDetector.find_declared_encoding(data, is_html=True):
+        return content
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return content
+
+
+def _get_text_clean(c):
+    return c.get_text(strip=True).replace("\xa0", "")
+
+
+def _parse_angler_cell(c):
+    lines = [
+        line.strip() for line in c.get_text(separator="\n").split("\n") if line.strip()
+    ]
+    name = lines[0] if lines else ""
+    strong_tags = c.find_all("strong", limit=2)
+    if len(strong_tags) >= 2:
+        city = strong_tags[0].get_text(strip=True)
+        state = strong_tags[1].get_text(strip=True)
+        hometown = f"{city}, {state}"
+    else:
+        hometown = ""
+    return name.title(), hometown.title()
+
+
+def _parse_result_row(cells):
     try:
-        response = s.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        metadata = {
-            "Date": None,
-            "Region": None,
-            "Tournament": None,
-            "Tournament Trail": None,
-        }
-        for row in soup.find_all("tr"):
-            label_cell = row.find("td", class_="white", align="right")
-            if label_cell and label_cell.text.strip().endswith(":"):
-                label = label_cell.text.strip().replace(":", "")
-                value_cell = row.find("td", class_="babyBlue")
-                if value_cell and label in metadata:
+        place = int(_get_text_clean(cells[0]))
+    except ValueError:
+        return None  # header rows or non-numeric places
+    img_tag = cells[1].find("img")
+    angler1, hometown1 = _parse_angler_cell(cells[3])
+    angler2, hometown2 = _parse_angler_cell(cells[4])
+    return {
+        "place": place,
+        "skeeter_boat": True
+        if img_tag and "skeeter" in img_tag.get("src", "").lower()
+        else False,
+        "angler1": angler1,
+        "angler1_hometown": hometown1,
+        "angler2": angler2,
+        "angler2_hometown": hometown2,
+        "fish": int(_get_text_clean(cells[5])),
+        "big bass": float(_get_text_clean(cells[6])),
+        "Wt.": float(_get_text_clean(cells[7])),
+        "prize": _get_text_clean(cells[8]) if cells[8] else None,
+    }
+
+
+def parse_tournament_results(content, parser=PARSER):
+    # One parse, keeping only table rows, and one walk over them that picks
+    # up both the metadata label rows and the result rows.
+    soup = BeautifulSoup(_decode(content), parser, parse_only=SoupStrainer("tr"))
+    metadata = {
+        "Date": None,
+        "Region": None,
+        "Tournament": None,
+        "Tournament Trail": None,
+    }
+    results = []
+    for row in soup.find_all("tr"):
+        cells = row.find_all("td")
+        if not cells:
+            continue
+        label_cell = next(
+            (
+                c
+                for c in cells
+                if "white" in c.get("class", ()) and c.get("align") == "right"
+            ),
+            None,
+        )
+        if label_cell:
+            text = label_cell.get_text().strip()
+            label = text.replace(":", "")
+            if text.endswith(":") and label in metadata:
+                value_cell = next(
+                    (c for c in cells if "babyBlue" in c.get("class", ())), None
+                )
+                if value_cell:
                     metadata[label] = value_cell.get_text(strip=True)
-        return {"metadata": metadata, "results": _parse_results_table()}
+        if len(cells) < 9:
+            continue  # skip malformed or irrelevant rows
+        result = _parse_result_row(cells)
+        if result is not None:
+            results.append(result)
+    return {"metadata": metadata, "results": results}
+
+
+def get_tournament_results(fetcher, url):
+    try:
+        return parse_tournament_results(fetcher.get(url))
     except requests.RequestException as e:
         logger.error(f"Error parsing {url}: {e}")
         return None
 
 
-def main():
-    with requests.Session() as session:
-        get_tournament_links(
-            s=session, urls=generate_annual_links(min_year=MIN_YEAR, max_year=MAX_YEAR)
+def write_tournament_results(result, data_dir=DATA_DIR):
+    t_name = result["metadata"]["Tournament"].replace(" ", "_")
+    t_date = result["metadata"]["Date"].replace(" ", "_").replace(",", "")
+    filename = Path(data_dir) / f"{t_name}_{t_date}.json"
+    with open(filename, mode="w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4)
+        logger.debug(f"Wrote {t_name} {t_date} results to: {filename}")
+    return filename
+
+
+_DONE = None  # end-of-stream marker between pipeline stages
+
+
+def fetch_stage(fetcher, urls):
+    def _stage(out):
+        def _fetch(url):
+            try:
+                out.put((url, fetcher.get(url)))
+            except requests.RequestException as e:
+                logger.error(f"Error fetching {url}: {e}")
+
+        try:
+            for _ in fetcher.map(_fetch, urls):
+                pass
+        finally:
+            out.put(_DONE)
+
+    return _stage
+
+
+def cache_stage(state, urls):
+    # Feeds pages from the crawl cache instead of the network, to re-parse
+    # everything after a parser fix.
+    def _stage(out):
+        try:
+            for url in urls:
+                body = state.read_body(url)
+                if body is None:
+                    logger.warning(f"No cached page for {url}")
+                    continue
+                out.put((url, body))
+        finally:
+            out.put(_DONE)
+
+    return _stage
+
+
+def _parse_stage(pool, pages, out):
+    try:
+        while (item := pages.get()) is not _DONE:
+            url, content = item
+            out.put((url, pool.submit(parse_tournament_results, content)))
+    finally:
+        out.put(_DONE)
+
+
+def run_pipeline(source, write, parse_workers=PARSE_WORKERS, queue_size=QUEUE_SIZE):
+    # source -> pages -> parser processes -> parsed -> write, all running at
+    # once. Both queues are bounded, so a slow writer or busy parsers stall
+    # the fetchers instead of piling pages up in memory. Returns how many
+    # pages were written.
+    pages = queue.Queue(maxsize=queue_size)
+    parsed = queue.Queue(maxsize=queue_size)
+    written = 0
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        stages = [
+            threading.Thread(target=source, args=(pages,), daemon=True),
+            threading.Thread(
+                target=_parse_stage, args=(pool, pages, parsed), daemon=True
+            ),
+        ]
+        for t in stages:
+            t.start()
+        while (item := parsed.get()) is not _DONE:
+            url, future = item
+            try:
+                write(url, future.result())
+                written += 1
+            except Exception as e:
+                logger.error(f"Error processing {url}: {e}")
+        for t in stages:
+            t.join()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--links-file", type=Path, default=LINKS_FILE)
+    parser.add_argument(
+        "--since",
+        type=int,
+        default=date.today().year,
+        help="re-check year pages from this season on (older ones only if unseen)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="revalidate every year page and re-scrape every tournament",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="parse pages in a process pool while fetching continues",
+    )
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS)
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="re-parse every cached tournament page without fetching",
+    )
+    args = parser.parse_args(argv)
+
+    def _write(url, result):
+        state.record_output(url, write_tournament_results(result, args.data_dir))
+
+    state = CrawlState(args.cache_dir)
+    links = LinkRegistry(args.links_file)
+    # Up to and including the current season, which --since defaults to.
+    max_year = date.today().year + 1
+    years = range(MIN_YEAR, max_year)
+    year_urls = [
+        url
+        for y, url in zip(
+            years, generate_annual_links(MIN_YEAR, max_year, base_url=args.base_url)
         )
-        for url in ALL_LINKS:
-            result = get_tournament_results(s=session, url=url)
-            t_name = result["metadata"]["Tournament"].replace(" ", "_")
-            t_date = result["metadata"]["Date"].replace(" ", "_").replace(",", "")
-            filename = f"data/{t_name}_{t_date}.json"
-            with open(filename, mode="w", encoding="utf-8") as f:
-                json.dump(result, f, indent=4)
-                logger.debug(f"Wrote {t_name} {t_date} results to: {filename}")
+        if args.full or y >= args.since or url not in state
+    ]
+    try:
+        if args.reparse:
+            cached_links = [u for u in links if u in state]
+            written = run_pipeline(
+                cache_stage(state, cached_links), _write, args.parse_workers
+            )
+            logger.info(f"Re-parsed {written} of {len(cached_links)} cached pages")
+            return
+        with Fetcher(max_workers=args.workers, rate=args.rate) as fetcher:
+            cached = CachingFetcher(fetcher, state)
+            get_tournament_links(
+                cached, urls=year_urls, links=links, base_url=args.base_url
+            )
+            pending = [u for u in links if args.full or not state.has_output(u)]
+            logger.info(f"{len(pending)} of {len(links)} tournaments need scraping")
+            if args.pipeline:
+                run_pipeline(fetch_stage(cached, pending), _write, args.parse_workers)
+            else:
+                results = cached.map(
+                    lambda url: get_tournament_results(cached, url), pending
+                )
+                for url, result in zip(pending, results):
+                    if result is not None:
+                        _write(url, result)
+            logger.info(f"{cached.not_modified} pages were not modified")
+    finally:
+        links.compact()
+        state.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+import json
+import re
+from collections.abc import Iterable
+from sqlite3 import Connection
+
+# Full-text indexes for the search box, one row per tournament and per angler
+# with the rowid being the tournament's or angler's id, so a reload replaces
+# rows by primary key. unicode61 folds case and accents; the prefix indexes
+# make the "word*" terms match_query() builds as fast as whole words.
+SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tournament_search USING fts5 (
+        tournament,
+        lake,
+        trail,
+        region,
+        year,
+        prizes,
+        date UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS angler_search USING fts5 (
+        angler,
+        hometowns,
+        results UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    # Results per angler and hometown ('' when none was given), kept by
+    # deltas so an angler's row is rebuilt from a few rows rather than from
+    # every result they ever had.
+    """
+    CREATE TABLE IF NOT EXISTS angler_hometowns (
+        angler_id INTEGER NOT NULL REFERENCES anglers (id),
+        hometown TEXT NOT NULL COLLATE NOCASE,
+        results INTEGER NOT NULL,
+        PRIMARY KEY (angler_id, hometown)
+    ) WITHOUT ROWID
+    """,
+)
+
+_INDEX_TOURNAMENTS = """
+INSERT INTO tournament_search (
+    rowid, tournament, lake, trail, region, year, prizes, date
+)
+SELECT
+    t.id,
+    t.tournament,
+    t.lake,
+    t.tournament_trail,
+    t.region,
+    strftime('%Y', t.date),
+    (
+        SELECT group_concat(prize, ' · ') FROM (
+            SELECT DISTINCT r.prize FROM results r
+            WHERE r.tournament_id = t.id AND r.prize != ''
+        )
+    ),
+    t.date
+FROM tournaments t
+{where}
+"""
+# Adds sign (1 or -1) times the results of the tournaments to their anglers'
+# hometown counts and returns the anglers changed.
+_COUNT_HOMETOWNS = """
+INSERT INTO angler_hometowns (angler_id, hometown, results)
+SELECT angler_id, hometown, ? * COUNT(*) FROM (
+    SELECT a.id AS angler_id, COALESCE(r.angler1_hometown, '') AS hometown
+    FROM results r JOIN anglers a ON a.name = r.angler1
+    {where}
+    UNION ALL
+    SELECT a.id, COALESCE(r.angler2_hometown, '')
+    FROM results r JOIN anglers a ON a.name = r.angler2
+    {where}
+)
+WHERE true
+GROUP BY angler_id, hometown COLLATE NOCASE
+ON CONFLICT (angler_id, hometown) DO UPDATE SET results = results + excluded.results
+RETURNING angler_id
+"""
+_INDEX_ANGLERS = """
+INSERT INTO angler_search (rowid, angler, hometowns, results)
+SELECT a.id, a.name, group_concat(NULLIF(h.hometown, ''), ' · '), SUM(h.results)
+FROM anglers a
+JOIN angler_hometowns h ON h.angler_id = a.id
+{where}
+GROUP BY a.id
+"""
+_BY_ID = "WHERE {}.id IN (SELECT value FROM json_each(?))"
+_BY_TOURNAMENT = "WHERE r.tournament_id IN (SELECT value FROM json_each(?))"
+
+
+def create_search(conn: Connection) -> None:
+    for ddl in SEARCH_DDL:
+        conn.execute(ddl)
+
+
+def _delete(conn: Connection, table: str, ids: str) -> None:
+    conn.execute(
+        f"DELETE FROM {table} WHERE rowid IN (SELECT value FROM json_each(?))", (ids,)
+    )
+
+
+def _count_hometowns(conn: Connection, tournament_ids: str, sign: int) -> str:
+    rows = conn.execute(
+        _COUNT_HOMETOWNS.format(where=_BY_TOURNAMENT),
+        (sign, tournament_ids, tournament_ids),
+    ).fetchall()
+    return json.dumps(sorted({a_id for (a_id,) in rows}))
+
+
+def _index_anglers(conn: Connection, angler_ids: str) -> None:
+    conn.execute(
+        "DELETE FROM angler_hometowns WHERE results <= 0"
+        " AND angler_id IN (SELECT value FROM json_each(?))",
+        (angler_ids,),
+    )
+    _delete(conn, "angler_search", angler_ids)
+    conn.execute(_INDEX_ANGLERS.format(where=_BY_ID.format("a")), (angler_ids,))
+
+
+def index_tournaments(conn: Connection, tournament_ids: Iterable[int]) -> None:
+    # Reindex the tournaments' own fields, e.g. after their lake was set.
+    ids = json.dumps(list(tournament_ids))
+    if ids == "[]":
+        return
+    create_search(conn)
+    _delete(conn, "tournament_search", ids)
+    conn.execute(_INDEX_TOURNAMENTS.format(where=_BY_ID.format("t")), (ids,))
+
+
+def add_results(conn: Connection, tournament_ids: Iterable[int]) -> None:
+    # Index tournaments just loaded, and their anglers from the new results.
+    tournament_ids = list(tournament_ids)
+    if not tournament_ids:
+        return
+    create_search(conn)
+    _index_anglers(conn, _count_hometowns(conn, json.dumps(tournament_ids), 1))
+    index_tournaments(conn, tournament_ids)
+
+
+def remove_results(conn: Connection, tournament_ids: Iterable[int]) -> None:
+    # Unindex tournaments whose results are about to be deleted; called
+    # before the delete, as the anglers' counts come off their results.
+    ids = json.dumps(list(tournament_ids))
+    if ids == "[]":
+        return
+    create_search(conn)
+    _index_anglers(conn, _count_hometowns(conn, ids, -1))
+    _delete(conn, "tournament_search", ids)
+
+
+def unindex_anglers(conn: Connection, angler_ids: Iterable[int]) -> None:
+    # For anglers about to be deleted.
+    ids = json.dumps(list(angler_ids))
+    if ids == "[]":
+        return
+    create_search(conn)
+    conn.execute(
+        "DELETE FROM angler_hometowns WHERE angler_id IN"
+        " (SELECT value FROM json_each(?))",
+        (ids,),
+    )
+    _delete(conn, "angler_search", ids)
+
+
+def rebuild_search(conn: Connection) -> None:
+    create_search(conn)
+    conn.execute("DELETE FROM angler_hometowns")
+    conn.execute(_COUNT_HOMETOWNS.format(where=""), (1,)).fetchall()
+    for table, sql in [
+        ("tournament_search", _INDEX_TOURNAMENTS),
+        ("angler_search", _INDEX_ANGLERS),
+    ]:
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(sql.format(where=""))
+        # Merge the index into one b-tree; loads only append to it.
+        conn.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+
+def match_query(text: str) -> str | None:
+    # Free text to an FTS5 query: every word must match the start of a word
+    # in the row, so "lak trav" finds "Lake Travis". Words are quoted, so
+    # FTS5 syntax typed into the box is searched for rather than parsed.
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
@@ -0,0 +1,250 @@
+import json
+import os
+import threading
+from pathlib import Path
+from sqlite3 import Connection
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from db import DB_FILE
+from names import normalize_name
+
+
+def snapshot_path(db_file) -> Path:
+    # A database's snapshot sits next to it, so exporting a scratch database
+    # never replaces the app's.
+    return Path(db_file).with_suffix(".arrow")
+
+
+SNAPSHOT_FILE = Path(os.environ.get("TD_SNAPSHOT", snapshot_path(DB_FILE)))
+BATCH_ROWS = 64 * 1024
+
+_EXPORT_SQL = """
+SELECT
+    t.id AS tournament_id,
+    t.date,
+    strftime('%Y', t.date) AS year,
+    t.tournament,
+    t.lake,
+    t.region,
+    t.tournament_trail,
+    r.rowid AS result_id,
+    r.place,
+    r.skeeter_boat,
+    r.angler1,
+    r.angler1_hometown,
+    r.angler2,
+    r.angler2_hometown,
+    r.fish,
+    r.big_bass,
+    r.weight,
+    r.prize
+FROM results r
+JOIN tournaments t ON r.tournament_id = t.id
+ORDER BY t.id, r.place
+"""
+SCHEMA = pa.schema(
+    [
+        ("tournament_id", pa.int64()),
+        ("date", pa.string()),
+        ("year", pa.dictionary(pa.int32(), pa.string())),
+        ("tournament", pa.dictionary(pa.int32(), pa.string())),
+        ("lake", pa.dictionary(pa.int32(), pa.string())),
+        ("region", pa.dictionary(pa.int32(), pa.string())),
+        ("tournament_trail", pa.dictionary(pa.int32(), pa.string())),
+        ("result_id", pa.int64()),
+        ("place", pa.int64()),
+        ("skeeter_boat", pa.bool_()),
+        ("angler1", pa.dictionary(pa.int32(), pa.string())),
+        ("angler1_hometown", pa.dictionary(pa.int32(), pa.string())),
+        ("angler2", pa.dictionary(pa.int32(), pa.string())),
+        ("angler2_hometown", pa.dictionary(pa.int32(), pa.string())),
+        ("fish", pa.int64()),
+        ("big_bass", pa.float64()),
+        ("weight", pa.float64()),
+        ("prize", pa.string()),
+    ]
+)
+
+
+def export_snapshot(conn: Connection, path=SNAPSHOT_FILE) -> int:
+    # Written uncompressed in the Arrow IPC file format so readers can
+    # memory-map it without decoding, and renamed into place so a running app
+    # never maps a half-written file.
+    plain = pa.schema(
+        pa.field(
+            f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type
+        )
+        for f in SCHEMA
+    )
+    batches = []
+    cursor = conn.execute(_EXPORT_SQL)
+    while rows := cursor.fetchmany(BATCH_ROWS):
+        batches.append(
+            pa.record_batch(
+                [
+                    pa.array(col, type=pa.int64()).cast(f.type)
+                    if pa.types.is_boolean(f.type)
+                    else pa.array(col, type=f.type)
+                    for col, f in zip(zip(*rows), plain)
+                ],
+                schema=plain,
+            )
+        )
+    # IPC files can't replace dictionaries between batches, so encode and
+    # unify them over the whole table.
+    table = pa.Table.from_batches(batches, schema=plain).cast(SCHEMA)
+    table = table.unify_dictionaries()
+
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    return table.num_rows
+
+
+def _top3(table: pa.Table) -> pa.Table:
+    return table.filter(pc.is_in(table["place"], pa.array([1, 2, 3])))
+
+
+class Snapshot:
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = Path(path)
+        self.mtime_ns = os.stat(self.path).st_mtime_ns
+        with pa.memory_map(str(self.path)) as source:
+            self.table = pa.ipc.open_file(source).read_all()
+
+    def supports(self, name: str) -> bool:
+        return hasattr(self, f"_{name}")
+
+    def query(self, name: str, params=()) -> pd.DataFrame:
+        return getattr(self, f"_{name}")(*params)
+
+    def _avg_wt_yr(self) -> pd.DataFrame:
+        t = _top3(self.table)
+        t = t.filter(pc.is_valid(t["weight"]))
+        df = (
+            t.group_by(["year", "place"])
+            .aggregate([("weight", "mean")])
+            .to_pandas()
+            .rename(columns={"weight_mean": "avg_weight"})
+        )
+        df["avg_weight"] = df["avg_weight"].round(2)
+        return df[["year", "place", "avg_weight"]].astype({"year": str})
+
+    def _avg_win_wt_lake(self) -> pd.DataFrame:
+        t = _top3(self.table)
+        t = t.filter(pc.is_valid(t["lake"]))
+        df = (
+            t.group_by("lake")
+            .aggregate([("place", "min"), ("place", "count"), ("weight", "mean")])
+            .to_pandas()
+            .rename(
+                columns={
+                    "place_min": "place",
+                    "place_count": "tournament_count",
+                    "weight_mean": "avg_winning_weight",
+                }
+            )
+        )
+        df["avg_winning_weight"] = df["avg_winning_weight"].round(2)
+        return df[["lake", "place", "tournament_count", "avg_winning_weight"]].astype(
+            {"lake": str}
+        )
+
+    def _wt_lake_year(self) -> pd.DataFrame:
+        t = _top3(self.table)
+        t = t.filter(pc.is_valid(t["weight"]))
+        df = (
+            t.group_by(["year", "lake", "place"])
+            .aggregate([("weight", "mean")])
+            .to_pandas()
+            .rename(columns={"weight_mean": "weight"})
+            .astype({"year": str, "lake": object})
+        )
+        return df.sort_values(
+            ["year", "lake", "place"],
+            ascending=[False, True, True],
+            na_position="first",
+        ).reset_index(drop=True)
+
+    def _tournaments(self) -> pd.DataFrame:
+        t = self.table.select(["tournament_id", "tournament", "date"])
+        df = (
+            t.group_by(["tournament_id", "tournament", "date"])
+            .aggregate([])
+            .to_pandas()
+            .rename(columns={"tournament_id": "id"})
+            .astype({"tournament": str})
+        )
+        return df.sort_values("date", ascending=False).reset_index(drop=True)[
+            ["id", "tournament", "date"]
+        ]
+
+    def _top_twenty(self, tournament_ids: str) -> pd.DataFrame:
+        ids = pa.array(json.loads(tournament_ids), type=pa.int64())
+        t = self.table.filter(pc.is_in(self.table["tournament_id"], ids))
+        df = (
+            t.select(
+                [
+                    "tournament_id",
+                    "place",
+                    "angler1",
+                    "angler2",
+                    "fish",
+                    "big_bass",
+                    "weight",
+                    "prize",
+                ]
+            )
+            .to_pandas()
+            .astype({"angler1": object, "angler2": object})
+            .sort_values(["tournament_id", "place"], kind="stable")
+        )
+        return df.groupby("tournament_id").head(20).reset_index(drop=True)
+
+    def _all_anglers(self) -> pd.DataFrame:
+        names = pc.unique(
+            pa.chunked_array(
+                self.table["angler1"].chunks + self.table["angler2"].chunks
+            ).cast(pa.string())
+        ).drop_null()
+        df = pd.DataFrame({"angler": names.to_pylist()})
+        df = df[df["angler"] != ""]
+        df = df.loc[~df["angler"].str.lower().duplicated()]
+        df["norm"] = df["angler"].map(normalize_name)
+        return df.sort_values("angler").reset_index(drop=True)
+
+    def _angler_performance(self, name: str) -> pd.DataFrame:
+        name = name.lower()
+        t = self.table
+        mask = pc.or_kleene(
+            pc.equal(pc.utf8_lower(t["angler1"].cast(pa.string())), name),
+            pc.equal(pc.utf8_lower(t["angler2"].cast(pa.string())), name),
+        )
+        df = (
+            t.filter(pc.fill_null(mask, False))
+            .select(
+                ["date", "year", "lake", "place", "weight", "fish", "big_bass", "prize"]
+            )
+            .to_pandas()
+            .astype({"year": str, "lake": object})
+        )
+        return df.sort_values(
+            ["place", "date"], ascending=[True, False], kind="stable"
+        ).reset_index(drop=True)
+
+
+_snapshot: Snapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(path=SNAPSHOT_FILE) -> Snapshot:
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None or os.stat(path).st_mtime_ns != _snapshot.mtime_ns:
+            _snapshot = Snapshot(path)
+        return _snapshot
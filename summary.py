@@ -0,0 +1,69 @@
+import json
+from collections.abc import Iterable
+from sqlite3 import Connection
+
+SUMMARY_PLACES = (1, 2, 3)
+
+SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS summary_lake_year_place (
+    year TEXT NOT NULL,
+    lake TEXT NOT NULL,  -- '' for tournaments without a lake
+    place INTEGER NOT NULL,
+    result_count INTEGER NOT NULL,
+    weight_count INTEGER NOT NULL,
+    weight_total REAL NOT NULL,
+    weight_max REAL,
+    PRIMARY KEY (year, lake, place)
+) WITHOUT ROWID
+"""
+
+_AGGREGATE = f"""
+INSERT INTO summary_lake_year_place
+SELECT
+    strftime('%Y', t.date) AS year,
+    COALESCE(t.lake, '') AS lake,
+    r.place,
+    COUNT(*),
+    COUNT(r.weight),
+    COALESCE(SUM(r.weight), 0),
+    MAX(r.weight)
+FROM tournaments t
+JOIN results r ON r.tournament_id = t.id
+WHERE r.place IN {SUMMARY_PLACES} {{where}}
+GROUP BY 1, 2, 3
+"""
+
+_GROUPS_OF = """
+SELECT strftime('%Y', date), COALESCE(lake, '')
+FROM tournaments
+WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+
+def create_summaries(conn: Connection) -> None:
+    conn.execute(SUMMARY_DDL)
+
+
+def refresh_summaries(conn: Connection, tournament_ids: Iterable[int]) -> None:
+    # Recompute every (year, lake) group the given tournaments fall into, so a
+    # refresh is idempotent and never has to apply deltas.
+    ids = json.dumps(list(tournament_ids))
+    if ids == "[]":
+        return
+    create_summaries(conn)
+    conn.execute(
+        f"DELETE FROM summary_lake_year_place WHERE (year, lake) IN ({_GROUPS_OF})",
+        (ids,),
+    )
+    conn.execute(
+        _AGGREGATE.format(
+            where=f"AND (strftime('%Y', t.date), COALESCE(t.lake, '')) IN ({_GROUPS_OF})"
+        ),
+        (ids,),
+    )
+
+
+def rebuild_summaries(conn: Connection) -> None:
+    create_summaries(conn)
+    conn.execute("DELETE FROM summary_lake_year_place")
+    conn.execute(_AGGREGATE.format(where=""))
@@ -0,0 +1,90 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from loader import load_files  # noqa: E402
+from rate_anglers import audit  # noqa: E402
+from search import rebuild_search  # noqa: E402
+from summary import rebuild_summaries  # noqa: E402
+from synthetic import write_json  # noqa: E402
+
+
+def rename_anglers(paths, suffix: str) -> None:
+    for path in paths:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for result in data["results"]:
+            for key in ["angler1", "angler2"]:
+                if result[key]:
+                    result[key] += suffix
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_replace_deletes_anglers_left_without_results(tmp_path):
+    paths = write_json(tmp_path / "data", 20, anglers=100)
+    conn = sqlite3.connect(tmp_path / "t.db", isolation_level=None)
+    load_files(conn, paths, workers=1)
+    # Reload with every name respelled, so every old angler loses its results.
+    rename_anglers(paths, " Jr")
+    assert len(load_files(conn, paths, replace=True, workers=1)) == 20
+
+    # Names differing only in case are one angler.
+    names = {
+        name.lower()
+        for (name,) in conn.execute(
+            "SELECT angler1 FROM results UNION SELECT angler2 FROM results"
+        )
+        if name
+    }
+    anglers = {name.lower() for (name,) in conn.execute("SELECT name FROM anglers")}
+    assert anglers == names
+    for table, column in [
+        ("angler_hometowns", "angler_id"),
+        ("angler_search", "rowid"),
+        ("angler_ratings", "angler_id"),
+        ("team_ratings", "angler1_id"),
+        ("team_ratings", "angler2_id"),
+    ]:
+        (dangling,) = conn.execute(
+            f"SELECT COUNT(*) FROM {table}"
+            f" WHERE {column} NOT IN (SELECT id FROM anglers)"
+        ).fetchone()
+        assert dangling == 0, table
+    conn.close()
+
+
+def table_rows(conn, table: str, key: str = "rowid") -> list[tuple]:
+    return conn.execute(f"SELECT {key}, * FROM {table} ORDER BY {key}").fetchall()
+
+
+def test_incremental_upkeep_matches_full_rebuild(tmp_path):
+    paths = write_json(tmp_path / "data", 40, anglers=150)
+    conn = sqlite3.connect(tmp_path / "t.db", isolation_level=None)
+    # In several batches: the middle, the end (rated incrementally), the
+    # start (a ratings replay), then a reload with some names respelled.
+    load_files(conn, paths[10:25], batch_size=7, workers=1)
+    load_files(conn, paths[25:], batch_size=7, workers=1)
+    assert audit(conn) == []
+    load_files(conn, paths[:10], batch_size=7, workers=1)
+    rename_anglers(paths[10:30:3], " Jr")
+    load_files(conn, paths[5:35], batch_size=7, replace=True, workers=1)
+
+    tables = {
+        "tournament_search": "rowid",
+        "angler_search": "rowid",
+        "angler_hometowns": "angler_id, hometown",
+        "summary_lake_year_place": "lake, year, place",
+    }
+    incremental = {t: table_rows(conn, t, key) for t, key in tables.items()}
+    assert all(incremental.values())
+    rebuild_search(conn)
+    rebuild_summaries(conn)
+    for table, key in tables.items():
+        assert table_rows(conn, table, key) == incremental[table], table
+    assert audit(conn) == []
+    conn.close()
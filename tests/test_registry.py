@@ -0,0 +1,22 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from registry import Query  # noqa: E402
+
+
+def test_n_params_ignores_literals_and_comments():
+    conn = sqlite3.connect(":memory:")
+    q = Query("t", "SELECT ?, '?' -- and ?\n WHERE ? > 0")
+    assert q.n_params(conn) == 2
+
+
+def test_n_params_surfaces_other_errors():
+    conn = sqlite3.connect(":memory:")
+    with pytest.raises(sqlite3.ProgrammingError, match="one statement"):
+        Query("t", "SELECT 1; SELECT 2").n_params(conn)
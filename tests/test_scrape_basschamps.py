@@ -0,0 +1,29 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import scrape_basschamps as scraper  # noqa: E402
+from fixtures import FixtureServer, build_site  # noqa: E402
+
+
+def test_default_run_rechecks_current_season(tmp_path):
+    year = date.today().year
+    site = build_site(scraper.MIN_YEAR, year + 1, per_year=1)
+    with FixtureServer(site) as srv:
+        argv = [
+            "--base-url", srv.url,
+            "--rate", "1000",
+            "--data-dir", str(tmp_path),
+            "--cache-dir", str(tmp_path / "cache"),
+            "--links-file", str(tmp_path / "links.json"),
+        ]  # fmt: skip
+        scraper.main(argv)
+        srv.paths.clear()
+        # A rerun only re-checks this season's page, as --since defaults to
+        # the current year, and finds nothing new to scrape.
+        scraper.main(argv)
+    assert srv.paths == [f"/resultsIntro.cfm?type=team&yearSelected={year}"]
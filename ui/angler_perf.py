@@ -1,41 +1,47 @@
-import string
-import unicodedata
 from sqlite3 import Connection
 
 import altair as alt
 import pandas as pd
 import streamlit as st
 
-from db import db_conn, load_data, load_query
+from db import db_conn
+from name_index import get_name_index
+from perf import section
+from registry import get_query
 
 
-def normalize_name(name: str) -> str:
-    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
-    name = name.lower().translate(str.maketrans("", "", string.punctuation))
-    parts = name.split()
-    if len(parts) == 3 and len(parts[1]) == 1:  # Remove middle initial
-        parts.pop(1)
-    return " ".join(parts)
+def yearly_averages(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.assign(year=pd.to_datetime(df["date"]).dt.year)
+    return (
+        df.groupby("year")
+        .agg(avg_weight=("weight", "mean"), avg_place=("place", "mean"))
+        .reset_index()
+    )
 
 
+def prefetch(c: Connection) -> None:
+    get_name_index(c)
+
+
+@st.fragment
+@section
 @db_conn
 def show(c: Connection) -> None:
     st.title("Angler Performance Viewer")
-    anglers_df = load_data(c, q_file="queries/all_anglers.sql")
-    anglers_df = anglers_df.dropna().drop_duplicates().sort_values(by="angler")
-    anglers_df["norm"] = anglers_df["angler"].map(normalize_name)
-
     selected_angler_raw = st.text_input(
         "Search for Angler Name", "", placeholder="Type angler name ..."
     )
     if not selected_angler_raw:
         st.stop()
 
-    normalized_input = normalize_name(selected_angler_raw)
-    matches = anglers_df[anglers_df["norm"] == normalized_input]["angler"].tolist()
+    index = get_name_index(c)
+    matches = index.exact(selected_angler_raw)
     if not matches:
-        st.warning("No close match found ...")
-        st.stop()
+        suggestions = index.suggest(selected_angler_raw)
+        if not suggestions:
+            st.warning("No close match found ...")
+            st.stop()
+        angler = st.selectbox("No exact match. Did you mean:", suggestions)
     elif len(matches) > 1:
         chosen = st.selectbox("Multiple matches found. Please select one:", matches)
         angler = chosen
@@ -43,11 +49,7 @@ def show(c: Connection) -> None:
         angler = matches[0]
     st.success(f"Showing results for: **{angler}**")
 
-    df = pd.read_sql(
-        load_query(filename="queries/angler_performance.sql"),
-        c,
-        params=(angler, angler),
-    )
+    df = get_query("angler_performance")(c, params=(angler,))
     if df.empty:
         st.info("No tournament data found for that angler.")
         st.stop()
@@ -69,12 +71,7 @@ def show(c: Connection) -> None:
         hide_index=True,
         disabled=True,
     )
-    df["year"] = pd.to_datetime(df["date"]).dt.year
-    yearly_stats = (
-        df.groupby("year")
-        .agg(avg_weight=("weight", "mean"), avg_place=("place", "mean"))
-        .reset_index()
-    )
+    yearly_stats = yearly_averages(df)
     st.subheader("📈 Yearly Average Stats")
     c1, c2 = st.columns(2)
     weight_chart = alt.Chart(yearly_stats).mark_line(
@@ -4,40 +4,27 @@ import altair as alt
 import pandas as pd
 import streamlit as st
 
-from constants import PLACES, TEXT_COLOR
-from db import db_conn, load_data
+from constants import PLACES
+from db import db_conn
+from perf import section
+from registry import data_version, get_query
+from ui.charts import cached_specs, stacked_labels, vega_spec
 
 
-@db_conn
-def show(c: Connection) -> None:
-    st.header("🎣Average Winning Weight Per Year")
+def chart_data(c: Connection) -> pd.DataFrame:
     df = (
-        load_data(c, q_file="queries/avg_wt_yr.sql")
+        get_query("avg_wt_yr")(c)
         .pivot(index="year", columns="place", values="avg_weight")
         .fillna(0)
         .reset_index()
     )
-    rows = []
-    for _, r in df.iterrows():
-        y, p = r["year"], {1: r.get(1, 0), 2: r.get(2, 0), 3: r.get(3, 0)}
-        base = 0
-        for place, emoji in zip([3, 2, 1], PLACES[::-1]):
-            height = p[place]
-            rows.append(
-                {
-                    "year": y,
-                    "place": emoji,
-                    "avg_weight": height,
-                    "label_y": base + height / 2,
-                    "label": f"{height:.2f}",
-                    "avg_weight_lbs": f"{height:.2f} lbs",
-                }
-            )
-            base += height
+    return stacked_labels(df, id_cols=["year"], value_name="avg_weight")
 
-    df_label = pd.DataFrame(rows)
+
+def chart_spec(df_label: pd.DataFrame) -> dict:
+    data = alt.NamedData("avg_wt_yr")
     bars = (
-        alt.Chart(df_label)
+        alt.Chart(data)
         .mark_bar()
         .encode(
             x="year:N",
@@ -56,7 +43,7 @@ def show(c: Connection) -> None:
         )
     )
     labels = (
-        alt.Chart(df_label)
+        alt.Chart(data)
         .mark_text(
             align="center",
             baseline="middle",
@@ -67,4 +54,18 @@ def show(c: Connection) -> None:
         )
         .encode(x="year:N", y="label_y:Q", text="label:N")
     )
-    st.altair_chart(bars + labels, use_container_width=True)
+    return vega_spec(bars + labels, {"avg_wt_yr": df_label})
+
+
+def prefetch(c: Connection) -> dict:
+    return cached_specs(
+        ("avg_winning_wt", data_version(c)), lambda: chart_spec(chart_data(c))
+    )
+
+
+@st.fragment
+@section
+@db_conn
+def show(c: Connection) -> None:
+    st.header("🎣Average Winning Weight Per Year")
+    st.vega_lite_chart(prefetch(c), use_container_width=True)
@@ -4,18 +4,23 @@ import altair as alt
 import pandas as pd
 import streamlit as st
 
-from constants import TEXT_COLOR
-from db import db_conn, load_data
+from constants import text_color
+from db import db_conn
+from perf import section
+from registry import data_version, get_query
+from ui.charts import cached_specs, vega_spec
 
 
-@db_conn
-def show(c: Connection):
-    st.header("🎣Average Winning Weight & Frequency per Lake")
-    df = load_data(c, q_file="queries/avg_win_wt_lake.sql")
+def chart_data(c: Connection) -> pd.DataFrame:
+    df = get_query("avg_win_wt_lake")(c)
     df = df.sort_values("avg_winning_weight", ascending=False).reset_index(drop=True)
     df["lake"] = pd.Categorical(df["lake"], categories=df["lake"], ordered=True)
+    return df
+
+
+def chart_spec(df: pd.DataFrame) -> dict:
     max_count = df["tournament_count"].max()
-    base = alt.Chart(df).encode(
+    base = alt.Chart(alt.NamedData("avg_win_wt_lake")).encode(
         x=alt.X(
             "lake:N",
             title="Lake",
@@ -27,7 +32,7 @@ def show(c: Connection):
         y=alt.Y(
             "avg_winning_weight:Q", axis=alt.Axis(title="Avg Winning Weight (lbs)")
         ),
-        tooltip=["lake", "avg_winning_weight", "tournament_count"],
+        tooltip=["lake:O", "avg_winning_weight:Q", "tournament_count:Q"],
     )
     line = base.mark_line(interpolate="monotone", color="orange", strokeWidth=2).encode(
         y=alt.Y(
@@ -35,13 +40,13 @@ def show(c: Connection):
             axis=alt.Axis(title="Tournament Count", orient="right"),
             scale=alt.Scale(domain=(1, max_count + 1)),
         ),
-        tooltip=["lake", "avg_winning_weight", "tournament_count"],
+        tooltip=["lake:O", "avg_winning_weight:Q", "tournament_count:Q"],
     )
     text = base.mark_text(
         align="center",
         baseline="bottom",
         dy=-5,
-        color=TEXT_COLOR,
+        color=text_color(),
         fontSize=12,
         fontStyle="bold",
     ).encode(
@@ -53,4 +58,18 @@ def show(c: Connection):
         .resolve_scale(y="independent")
         .properties(height=500)
     )
-    st.altair_chart(chart, use_container_width=True)
+    return vega_spec(chart, {"avg_win_wt_lake": df})
+
+
+def prefetch(c: Connection) -> dict:
+    return cached_specs(
+        ("avg_winning_wt_lake", data_version(c)), lambda: chart_spec(chart_data(c))
+    )
+
+
+@st.fragment
+@section
+@db_conn
+def show(c: Connection):
+    st.header("🎣Average Winning Weight & Frequency per Lake")
+    st.vega_lite_chart(prefetch(c), use_container_width=True)
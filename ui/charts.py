@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from collections.abc import Callable, Hashable
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from cachetools import LRUCache
+
+from constants import PLACES
+
+_specs: LRUCache = LRUCache(maxsize=64)
+_specs_lock = threading.Lock()
+
+
+def stacked_labels(
+    pivot: pd.DataFrame, id_cols: list[str], value_name: str, labels=PLACES
+) -> pd.DataFrame:
+    # pivot has one row per id and a column per place (1..len(labels)); the
+    # result has one row per id/place, stacked last place first, with the
+    # midpoint of each segment for the bar labels.
+    places = list(range(len(labels), 0, -1))
+    heights = pivot.reindex(columns=places, fill_value=0).to_numpy(dtype=float)
+    n, k = heights.shape
+    label_y = np.cumsum(heights, axis=1) - heights / 2
+
+    # Weights repeat heavily (two decimals, zero fills), so format each
+    # distinct value once.
+    codes, uniques = pd.factorize(heights.ravel())
+    text = np.array([f"{h:.2f}" for h in uniques], dtype=object)
+    lbs = np.array([f"{h:.2f} lbs" for h in uniques], dtype=object)
+
+    out = pivot[id_cols].iloc[np.repeat(np.arange(n), k)].reset_index(drop=True)
+    out["place"] = np.tile(np.asarray(labels[::-1], dtype=object), n)
+    out[value_name] = heights.ravel()
+    out["label_y"] = label_y.ravel()
+    out["label"] = text[codes]
+    out[f"{value_name}_lbs"] = lbs[codes]
+    return out
+
+
+def _fields(spec) -> set[str]:
+    # Every column an encoding refers to, anywhere in a (layered) spec.
+    if isinstance(spec, dict):
+        found = {spec["field"]} if isinstance(spec.get("field"), str) else set()
+        for value in spec.values():
+            found |= _fields(value)
+        return found
+    if isinstance(spec, list):
+        return set().union(*map(_fields, spec))
+    return set()
+
+
+def _arrow_bytes(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df.reset_index(drop=True))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def vega_spec(
+    chart: alt.TopLevelMixin | dict, datasets: dict[str, pd.DataFrame]
+) -> dict:
+    # chart reads its data from alt.NamedData(name) for each name in
+    # datasets, so Altair never touches the frames. Returns the Vega-Lite
+    # dict st.vega_lite_chart takes, with each frame cut down to the columns
+    # the encodings use and serialized to Arrow the way st.altair_chart does.
+    # No transforms: their expressions can use columns no encoding names.
+    # chart may also be an already converted chart dict, to reuse one chart
+    # for several datasets.
+    spec = chart if isinstance(chart, dict) else chart.to_dict()
+    # Drop the default theme's 300px view size, as st.altair_chart does.
+    spec = {k: v for k, v in spec.items() if k != "config"}
+    used = _fields(spec)
+    spec["datasets"] = {}
+    for name, df in datasets.items():
+        data = _arrow_bytes(df[[c for c in df.columns if c in used]])
+        # Streamlit keys the frontend's dataset cache by name, so name each
+        # by its content.
+        digest = hashlib.md5(data).hexdigest()
+        spec = _rename_data(spec, name, digest)
+        spec["datasets"][digest] = data
+    return spec
+
+
+def _rename_data(spec, old: str, new: str):
+    if isinstance(spec, dict):
+        if spec.get("name") == old and set(spec) == {"name"}:
+            return {"name": new}
+        return {k: _rename_data(v, old, new) for k, v in spec.items()}
+    if isinstance(spec, list):
+        return [_rename_data(v, old, new) for v in spec]
+    return spec
+
+
+def cached_specs(key: Hashable, build: Callable[[], dict]) -> dict:
+    # Chart specs by (page, data version): a page view whose data hasn't
+    # changed skips the query, the data prep and Altair altogether.
+    with _specs_lock:
+        specs = _specs.get(key)
+    if specs is None:
+        specs = build()
+        with _specs_lock:
+            _specs[key] = specs
+    return specs
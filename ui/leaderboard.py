@@ -0,0 +1,62 @@
+from sqlite3 import Connection
+
+import pandas as pd
+import streamlit as st
+
+from db import db_conn
+from perf import section
+from registry import get_query
+
+LIMIT = 100
+MIN_EVENTS = 5
+
+
+def leaderboard(c: Connection, table: str, min_events: int) -> pd.DataFrame:
+    # Ratings are kept up to date by the loader (see ratings.py), so this is
+    # an index walk from the top rating down to LIMIT rows.
+    df = get_query(f"{table}_ratings")(c, params=(min_events, LIMIT))
+    df.insert(0, "rank", range(1, len(df) + 1))
+    return df
+
+
+def prefetch(c: Connection) -> None:
+    for table in ["angler", "team"]:
+        leaderboard(c, table, MIN_EVENTS)
+
+
+@st.fragment
+@section
+@db_conn
+def show(c: Connection) -> None:
+    st.header("Power Ratings")
+    st.caption(
+        "Elo ratings over every tournament in date order: each finish counts as a"
+        " win over every team placed below and a loss to every team above."
+    )
+    min_events = st.number_input(
+        "Minimum tournaments fished", min_value=1, value=MIN_EVENTS, step=1
+    )
+    column_config = {
+        "rank": st.column_config.NumberColumn("Rank", width="small"),
+        "angler": st.column_config.TextColumn("Angler", width="medium"),
+        "angler1": st.column_config.TextColumn("Angler", width="medium"),
+        "angler2": st.column_config.TextColumn("Partner", width="medium"),
+        "rating": st.column_config.NumberColumn("Rating", format="%.0f"),
+        "peak": st.column_config.NumberColumn("Peak", format="%.0f"),
+        "events": st.column_config.NumberColumn("Tournaments", width="small"),
+        "last_date": st.column_config.TextColumn("Last Fished", width="small"),
+    }
+    anglers_tab, teams_tab = st.tabs(["Anglers", "Teams"])
+    for tab, table in [(anglers_tab, "angler"), (teams_tab, "team")]:
+        with tab:
+            df = leaderboard(c, table, int(min_events))
+            if df.empty:
+                st.info("No ratings yet.")
+                continue
+            st.data_editor(
+                df,
+                column_config=column_config,
+                use_container_width=True,
+                hide_index=True,
+                disabled=True,
+            )
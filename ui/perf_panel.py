@@ -0,0 +1,35 @@
+import pandas as pd
+import streamlit as st
+
+import perf
+from db import QUERY_CACHE, get_pool
+
+
+def show() -> None:
+    # Debug panel, only added to the sidebar when TD_PERF=1.
+    recs = perf.records()
+    with st.sidebar.expander(f"Performance ({len(recs)} samples)"):
+        st.dataframe(
+            pd.DataFrame(perf.summarize(recs)),
+            hide_index=True,
+            column_config={
+                "p50_ms": st.column_config.NumberColumn("p50 ms", format="%.1f"),
+                "p95_ms": st.column_config.NumberColumn("p95 ms", format="%.1f"),
+                "max_ms": st.column_config.NumberColumn("max ms", format="%.1f"),
+                "mib": st.column_config.NumberColumn("MiB", format="%.2f"),
+                "hit_rate": st.column_config.NumberColumn("hits", format="%.2f"),
+            },
+        )
+        st.caption("Query cache")
+        st.json(QUERY_CACHE.stats(), expanded=False)
+        st.caption("Connection pool")
+        st.json(get_pool().stats(), expanded=False)
+        st.download_button(
+            "Download samples (JSON lines)",
+            perf.export_jsonl(recs),
+            file_name="td-perf.jsonl",
+            mime="application/x-ndjson",
+        )
+        if st.button("Clear samples"):
+            perf.clear()
+            st.rerun()
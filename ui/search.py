@@ -0,0 +1,71 @@
+import re
+from sqlite3 import Connection
+
+import pandas as pd
+import streamlit as st
+
+from db import db_conn
+from perf import section
+from registry import get_query
+from search import match_query
+
+LIMIT = 20
+# The queries mark matches with these control characters, which can't occur
+# in the data, so the text can be escaped before they become highlights.
+MATCH_START, MATCH_END = "\x02", "\x03"
+
+
+def search(c: Connection, text: str) -> dict[str, pd.DataFrame]:
+    # Ranked hits per kind, best first; no hits for text without any words.
+    match = match_query(text)
+    return {
+        kind: get_query(f"search_{kind}")(c, params=(match, LIMIT))
+        for kind in ["tournaments", "anglers"]
+        if match is not None
+    }
+
+
+def _markdown(text) -> str:
+    if text is None or pd.isna(text):
+        return ""
+    text = re.sub(r"([\\`*_{}\[\]<>#|~$:])", r"\\\1", str(text))
+    return text.replace(MATCH_START, ":orange-background[").replace(MATCH_END, "]")
+
+
+def _tournament_hit(row) -> str:
+    where = " · ".join(
+        _markdown(v) for v in [row.lake, row.trail, row.region] if _markdown(v)
+    )
+    line = f"**{_markdown(row.tournament)}** ({row.date})"
+    if where:
+        line += f"  \n{where}"
+    if MATCH_START in (row.prizes or ""):
+        line += f"  \nPrizes: {_markdown(row.prizes)}"
+    return line
+
+
+def _angler_hit(row) -> str:
+    line = f"**{_markdown(row.angler)}** ({row.results} results)"
+    if hometowns := _markdown(row.hometowns):
+        line += f"  \n{hometowns}"
+    return line
+
+
+@section
+@db_conn
+def show(c: Connection, text: str) -> None:
+    st.header("Search")
+    hits = search(c, text)
+    if not any(len(df) for df in hits.values()):
+        st.info(f"Nothing found for “{text}”.")
+        return
+    col1, col2 = st.columns(2)
+    for col, kind, render in [
+        (col1, "tournaments", _tournament_hit),
+        (col2, "anglers", _angler_hit),
+    ]:
+        with col:
+            df = hits[kind]
+            st.subheader(f"{kind.title()} ({len(df)}{'+' if len(df) == LIMIT else ''})")
+            for row in df.itertuples():
+                st.markdown(render(row))
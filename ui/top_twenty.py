@@ -1,39 +1,90 @@
+import json
+import threading
 from sqlite3 import Connection
 
 import pandas as pd
 import streamlit as st
+from cachetools import LRUCache
 
-from db import db_conn, load_query
+from db import db_conn, db_version
+from perf import section
+from registry import get_query
 
+_results_cache: LRUCache = LRUCache(maxsize=512)
+_results_lock = threading.Lock()
 
+
+def top_twenty_results(c: Connection, tournament_ids: list[int]) -> dict:
+    version = db_version(c)
+    with _results_lock:
+        found = {
+            t_id: _results_cache[(version, t_id)]
+            for t_id in tournament_ids
+            if (version, t_id) in _results_cache
+        }
+    missing = [t_id for t_id in tournament_ids if t_id not in found]
+    if missing:
+        df = get_query("top_twenty")(c, params=(json.dumps(missing),))
+        groups = dict(tuple(df.groupby("tournament_id")))
+        for t_id in missing:
+            found[t_id] = (
+                (groups[t_id] if t_id in groups else df.iloc[0:0])
+                .drop(columns="tournament_id")
+                .reset_index(drop=True)
+            )
+        with _results_lock:
+            for t_id in missing:
+                _results_cache[(version, t_id)] = found[t_id]
+    return found
+
+
+def tournament_choices(c: Connection) -> dict[int, dict[str, int]]:
+    # year -> {"<tournament> (<date>)": id}, newest year first.
+    tournaments_df = get_query("tournaments")(c)
+    tournaments_df["year"] = pd.to_datetime(tournaments_df["date"]).dt.year
+    tournaments_df["label"] = (
+        tournaments_df["tournament"] + " (" + tournaments_df["date"] + ")"
+    )
+    return {
+        year: dict(zip(group["label"], group["id"]))
+        for year, group in sorted(
+            tournaments_df.groupby("year"), key=lambda g: g[0], reverse=True
+        )
+    }
+
+
+def prefetch(c: Connection) -> dict:
+    # What the page shows before anything is selected: the first tournament
+    # of every year.
+    choices = tournament_choices(c)
+    return top_twenty_results(
+        c, [int(next(iter(m.values()))) for m in choices.values()]
+    )
+
+
+@st.fragment
+@section
 @db_conn
 def show(c: Connection) -> None:
     st.header("Top 20 Teams by Tournament")
-    tournaments_df = pd.read_sql(
-        "SELECT id, tournament, date FROM tournaments ORDER BY date DESC", c
-    )
-    tournaments_df["year"] = pd.to_datetime(tournaments_df["date"]).dt.year
-    years = sorted(tournaments_df["year"].unique(), reverse=True)
+    choices = tournament_choices(c)
+    years = list(choices)
     tab_objs = st.tabs([str(year) for year in years])
+
+    # Render every tab's selector first so the selected tournaments of all
+    # tabs can be fetched with a single query.
+    selected_ids = []
     for idx, year in enumerate(years):
         with tab_objs[idx]:
-            tournaments_in_year = tournaments_df[tournaments_df["year"] == year].copy()
-            tournaments_in_year["label"] = (
-                tournaments_in_year["tournament"]
-                + " ("
-                + tournaments_in_year["date"]
-                + ")"
-            )
-            tournament_map = dict(
-                zip(tournaments_in_year["label"], tournaments_in_year["id"])
-            )
+            tournament_map = choices[year]
             selected_label = st.selectbox(
                 "Select a Tournament", list(tournament_map.keys()), key=f"select_{year}"
             )
-            selected_id = tournament_map[selected_label]
-            results_df = pd.read_sql(
-                load_query(filename="queries/top_twenty.sql"), c, params=(selected_id,)
-            )
+            selected_ids.append(int(tournament_map[selected_label]))
+
+    results = top_twenty_results(c, selected_ids)
+    for idx, selected_id in enumerate(selected_ids):
+        with tab_objs[idx]:
             st.subheader("Top 20 Results")
             column_config = {
                 "place": st.column_config.NumberColumn("Place", width="small"),
@@ -45,7 +96,7 @@ def show(c: Connection) -> None:
                 "prize": st.column_config.TextColumn("Prize", width="large"),
             }
             st.data_editor(
-                results_df,
+                results[selected_id],
                 column_config=column_config,
                 use_container_width=True,
                 hide_index=True,
@@ -5,86 +5,89 @@ import pandas as pd
 import streamlit as st
 
 from constants import PLACES
-from db import db_conn, load_data
+from db import db_conn
+from perf import section
+from registry import data_version, get_query
+from ui.charts import cached_specs, stacked_labels, vega_spec
 
 
-@db_conn
-def show(c: Connection) -> None:
-    st.header("🏆Winning Weights by Lake per Year")
+def chart_data(c: Connection) -> pd.DataFrame:
     df = (
-        load_data(c, q_file="queries/wt_lake_year.sql")
+        get_query("wt_lake_year")(c)
         .pivot(index=["year", "lake"], columns="place", values="weight")
         .fillna(0)
         .reset_index()
     )
-    rows = []
-    for _, r in df.iterrows():
-        y, lake = r["year"], r["lake"]
-        p = {1: r.get(1, 0), 2: r.get(2, 0), 3: r.get(3, 0)}
-        base = 0
-        for place, emoji in zip([3, 2, 1], PLACES[::-1]):
-            height = p[place]
-            rows.append(
-                {
-                    "year": y,
-                    "lake": lake,
-                    "place": emoji,
-                    "weight": height,
-                    "label_y": base + height / 2,
-                    "label": f"{height:.2f}",
-                    "weight_lbs": f"{height:.2f} lbs",
-                }
-            )
-            base += height
-
-    df_label = pd.DataFrame(rows)
+    df_label = stacked_labels(df, id_cols=["year", "lake"], value_name="weight")
     df_label["place"] = pd.Categorical(
         df_label["place"], categories=PLACES, ordered=True
     )
+    return df_label
 
+
+def chart_specs(df_label: pd.DataFrame) -> dict[str, dict]:
+    # One chart per year, newest first. The years differ only in their data,
+    # so Altair builds the chart once.
+    data = alt.NamedData("wt_lake_year")
+    bars = (
+        alt.Chart(data)
+        .mark_bar()
+        .encode(
+            x=alt.X(
+                "lake:N",
+                title="Lake",
+                sort="-y",
+                axis=alt.Axis(labelFontSize=10, labelLimit=0, labelFontStyle="bold"),
+            ),
+            y=alt.Y("weight:Q", title="Weight(lbs)", stack="zero"),
+            color=alt.Color(
+                "place:N",
+                sort=PLACES,
+                scale=alt.Scale(scheme="blues"),
+                title="Place",
+            ),
+            tooltip=[
+                alt.Tooltip("lake:N", title="Lake"),
+                alt.Tooltip("place:N", title="Place"),
+                alt.Tooltip("weight_lbs:N", title="Weight"),
+            ],
+        )
+        .properties(height=500)
+    )
+    labels = (
+        alt.Chart(data)
+        .mark_text(
+            align="center",
+            baseline="middle",
+            color="white",
+            fontSize=11,
+            fontStyle="bold",
+            tooltip=None,
+        )
+        .encode(x="lake:N", y="label_y:Q", text="label:N")
+        .properties(height=500)
+    )
+    chart = (bars + labels).properties(height=500).to_dict()
     years = sorted(df_label["year"].unique(), reverse=True)
-    tabs = st.tabs(years)
-    for idx, year in enumerate(years):
-        with tabs[idx]:
-            df_year = df_label[df_label["year"] == year]
-            bars = (
-                alt.Chart(df_year)
-                .mark_bar()
-                .encode(
-                    x=alt.X(
-                        "lake:N",
-                        title="Lake",
-                        sort="-y",
-                        axis=alt.Axis(
-                            labelFontSize=10, labelLimit=0, labelFontStyle="bold"
-                        ),
-                    ),
-                    y=alt.Y("weight:Q", title="Weight(lbs)", stack="zero"),
-                    color=alt.Color(
-                        "place:N",
-                        sort=PLACES,
-                        scale=alt.Scale(scheme="blues"),
-                        title="Place",
-                    ),
-                    tooltip=[
-                        alt.Tooltip("lake:N", title="Lake"),
-                        alt.Tooltip("place:N", title="Place"),
-                        alt.Tooltip("weight_lbs:N", title="Weight"),
-                    ],
-                ).properties(height=500)
-            )
-            labels = (
-                alt.Chart(df_year)
-                .mark_text(
-                    align="center",
-                    baseline="middle",
-                    color="white",
-                    fontSize=11,
-                    fontStyle="bold",
-                    tooltip=None,
-                )
-                .encode(x="lake:N", y="label_y:Q", text="label:N").properties(height=500)
-            )
-            st.altair_chart(
-                (bars + labels).properties(height=500), use_container_width=True
-            )
+    return {
+        year: vega_spec(chart, {"wt_lake_year": df_label[df_label["year"] == year]})
+        for year in years
+    }
+
+
+def prefetch(c: Connection) -> dict[str, dict]:
+    return cached_specs(
+        ("winning_wt_lake", data_version(c)), lambda: chart_specs(chart_data(c))
+    )
+
+
+@st.fragment
+@section
+@db_conn
+def show(c: Connection) -> None:
+    st.header("🏆Winning Weights by Lake per Year")
+    specs = prefetch(c)
+    tabs = st.tabs(list(specs))
+    for tab, spec in zip(tabs, specs.values()):
+        with tab:
+            st.vega_lite_chart(spec, use_container_width=True)
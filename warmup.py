@@ -0,0 +1,76 @@
+import argparse
+import logging
+import os
+import time
+from importlib import import_module
+from pathlib import Path
+
+from db import get_pool
+
+logger = logging.getLogger(__name__)
+
+# On unless TD_WARMUP=0: the first session starts warm_up() in the background
+# (see app.py), so later visitors find every cache filled.
+ENABLED = os.environ.get("TD_WARMUP", "1") != "0"
+PAGES = [
+    "avg_winning_wt",
+    "avg_winning_wt_lake",
+    "winning_wt_lake",
+    "top_twenty",
+    "angler_perf",
+    "leaderboard",
+]
+READ_CHUNK = 1024 * 1024
+
+
+def prime_page_cache(database: Path) -> int:
+    # Read the database (and its WAL) once so the OS has it in memory before
+    # the first query seeks around in it. Returns the bytes read.
+    total = 0
+    for path in [database, Path(f"{database}-wal")]:
+        try:
+            with open(path, "rb", buffering=0) as f:
+                while chunk := f.read(READ_CHUNK):
+                    total += len(chunk)
+        except FileNotFoundError:
+            pass
+    return total
+
+
+def warm_up(pages=PAGES) -> dict[str, float]:
+    # Imports every page and runs its prefetch(), which fills the query,
+    # chart spec, results and name index caches the page reads from, without
+    # rendering anything. Returns seconds per step.
+    timings = {}
+    start = time.perf_counter()
+    pool = get_pool()
+    prime_page_cache(pool.database)
+    timings["page cache"] = time.perf_counter() - start
+    with pool.connection() as c:
+        for page in pages:
+            start = time.perf_counter()
+            try:
+                import_module(f"ui.{page}").prefetch(c)
+            except Exception:
+                logger.exception(f"Warm-up of {page} failed")
+            timings[page] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    # At boot, before the server takes traffic: warms the OS page cache and
+    # checks every page's data can be built. The in-process caches are warmed
+    # by the server itself.
+    parser = argparse.ArgumentParser(description="Warm up the tournament app.")
+    parser.add_argument("pages", nargs="*", default=PAGES)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    total = 0.0
+    for step, seconds in warm_up(args.pages).items():
+        total += seconds
+        print(f"{step:>20} {seconds * 1000:>9.1f} ms")
+    print(f"{'total':>20} {total * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()